@@ -105,6 +105,7 @@ if not st.session_state.data_loaded and check_data_exists():
             st.session_state.match_data = data['match_data']
             st.session_state.team_defensive = data['team_defensive']
             st.session_state.team_attacking = data['team_attacking']
+            st.session_state.data_version = data['data_version']
             st.session_state.data_loaded = True
 
 # Main content - Home page
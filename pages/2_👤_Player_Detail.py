@@ -29,20 +29,13 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import sys
+from html import escape
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-# Import fixture analyzer
-try:
-    from utils.fixture_analyzer import FixtureAnalyzer
-except:
-    FixtureAnalyzer = None
-
 # Page config
 st.set_page_config(
     page_title="Player Detail - FPL Dashboard",
@@ -57,10 +50,148 @@ if 'player_data' not in st.session_state or st.session_state.player_data is None
         st.switch_page("app.py")
     st.stop()
 
+# Columns the sidebar lists and filters on, held as categoricals on this page
+CATEGORY_COLS = ('full_name', 'position', 'team')
+
+def _categorized(player_data):
+    """
+    Player data with the sidebar's name/position/team columns as categoricals,
+    so their sorted values are read from the categories and the filters compare
+    integer codes - built once per loaded frame and kept in the session
+    """
+    cached = st.session_state.get('_categorized_player_data')
+    if cached is None or cached[0] is not player_data:
+        categorized = player_data.copy(deep=False)
+        for col in CATEGORY_COLS:
+            if col in categorized.columns:
+                categorized[col] = categorized[col].astype('category')
+        
+        cached = (player_data, categorized)
+        st.session_state['_categorized_player_data'] = cached
+    return cached[1]
+
 # Get data from session state
-player_data = st.session_state.player_data
+player_data = _categorized(st.session_state.player_data)
 match_data = st.session_state.match_data
 
+# Per-match columns that must be numeric for the tables and charts
+NUMERIC_COLS = ('round', 'total_points', 'goals_scored', 'assists',
+                'expected_goals', 'expected_assists', 'expected_goal_involvements',
+                'clean_sheets', 'goals_conceded', 'expected_goals_conceded',
+                'minutes', 'defensive_contribution', 'tackles',
+                'clearances_blocks_interceptions', 'recoveries',
+                'bps', 'bonus', 'influence', 'creativity', 'threat')
+
+# Resolve which of them the loaded match data actually has once, not on every rerun
+PRESENT_NUMERIC_COLS = tuple(
+    c for c in NUMERIC_COLS if match_data is not None and c in match_data.columns
+)
+
+# Narrow dtypes for the player's match columns: counts fit in int16, the
+# expected/ICT metrics in float32
+INT16_COLS = [c for c in ('round', 'minutes', 'goals_scored', 'assists', 'bonus', 'bps',
+                          'total_points', 'goals_conceded', 'clean_sheets')
+              if c in PRESENT_NUMERIC_COLS]
+FLOAT32_COLS = [c for c in ('expected_goals', 'expected_assists', 'expected_goal_involvements',
+                            'expected_goals_conceded', 'defensive_contribution',
+                            'influence', 'creativity', 'threat')
+                if c in PRESENT_NUMERIC_COLS]
+
+# Strength-based FDR for every integer opponent strength from 1000 (rows) by venue
+# (column 0 = away, 1 = home): normalize strength (typically 1000-1400) to the
+# 1-5 scale, adjust for venue and clamp to 1-5. From 1600 up both venues are at 5.
+_STRENGTH_FDR = np.clip(
+    (1 + (np.arange(601) / 400) * 4)[:, None] * np.array([1.15, 0.85]),
+    1.0, 5.0
+)
+
+# Defensive contributions per game needed to hit the DC target, by position
+_DC_THRESHOLDS = {
+    'GKP': 10,
+    'DEF': 10,
+    'MID': 12,
+    'FWD': 12
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _get_all_fixtures():
+    """Season fixture list from the FPL API, refreshed hourly"""
+    from utils.fixture_analyzer import get_fixture_analyzer
+    
+    return get_fixture_analyzer().get_all_fixtures()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _get_upcoming_by_team():
+    """Unfinished fixtures of every team sorted by gameweek, split from one pass over the season"""
+    all_fixtures = _get_all_fixtures()
+    upcoming = all_fixtures[~all_fixtures['finished'].to_numpy(dtype=bool)].sort_values('event', kind='stable')
+    
+    # Each fixture belongs to both its home and away team - group the row
+    # positions of both sides by team, in gameweek order
+    positions = np.tile(np.arange(len(upcoming)), 2)
+    team_ids = np.concatenate([upcoming['team_h'].to_numpy(), upcoming['team_a'].to_numpy()])
+    groups = pd.Series(positions).groupby(team_ids).apply(np.sort)
+    
+    return {team_id: upcoming.iloc[rows] for team_id, rows in groups.items()}
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _get_team_lut():
+    """Team short names and overall home/away strengths as arrays indexed by team id"""
+    from utils.fixture_analyzer import get_fixture_analyzer
+    
+    teams = get_fixture_analyzer().teams
+    size = max(teams, default=0) + 1
+    
+    team_short = np.full(size, 'N/A', dtype=object)
+    team_strength_home = np.full(size, 1000, dtype=np.int32)
+    team_strength_away = np.full(size, 1000, dtype=np.int32)
+    
+    for team_id, team in teams.items():
+        team_short[team_id] = team['short_name']
+        team_strength_home[team_id] = team.get('strength_overall_home', 1000)
+        team_strength_away[team_id] = team.get('strength_overall_away', 1000)
+    
+    return team_short, team_strength_home, team_strength_away
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _compute_fixture_fdr_df(team_id):
+    """Upcoming fixtures of a team with opponent and FDR, computed once per team"""
+    # Get ALL of this team's upcoming fixtures until GW38
+    team_fixtures = _get_upcoming_by_team().get(team_id)
+    
+    if team_fixtures is None or team_fixtures.empty:
+        return pd.DataFrame(columns=['GW', 'OPP', 'FDR'])
+    
+    is_home = team_fixtures['team_h'].to_numpy() == team_id
+    opponent_ids = np.where(is_home, team_fixtures['team_a'], team_fixtures['team_h'])
+    
+    # Opponent attributes for every fixture in one lookup
+    team_short, team_strength_home, team_strength_away = _get_team_lut()
+    
+    # Home games face the opponent's away strength and their difficulty rating, and vice versa
+    opp_strength = np.where(
+        is_home,
+        team_strength_away[opponent_ids],
+        team_strength_home[opponent_ids]
+    )
+    fdr = np.where(
+        is_home,
+        team_fixtures.get('team_h_difficulty', 3),
+        team_fixtures.get('team_a_difficulty', 3)
+    ).astype(float)
+    
+    # If FPL difficulty is not available (=0), fall back to the strength-based FDR
+    strength_fdr = _STRENGTH_FDR[np.clip(opp_strength - 1000, 0, len(_STRENGTH_FDR) - 1), is_home.astype(int)]
+    fdr = np.where((fdr == 0) | np.isnan(fdr), strength_fdr, fdr)
+    
+    fixtures_df = pd.DataFrame({
+        'GW': team_fixtures['event'].astype(int).to_numpy(),
+        'OPP': team_short[opponent_ids] + np.where(is_home, ' (H)', ' (A)'),
+        'FDR': np.round(fdr).astype(int)  # Integer FDR like in example
+    })
+    
+    return fixtures_df
+
 def get_fdr_color(fdr):
     """Get color based on FDR - turquoise for easy, pink for hard"""
     if fdr <= 2.0:
@@ -76,23 +207,118 @@ def get_fdr_color(fdr):
     else:
         return '#FF1493'  # Deep Pink - Very Hard
 
+# Colour of each integer FDR, so a whole fixture list is coloured with one take
+_FDR_COLORS = np.array([get_fdr_color(fdr) for fdr in range(6)], dtype=object)
+
+def get_fdr_colors(fdr_values):
+    """Vectorized get_fdr_color for integer FDR values"""
+    return _FDR_COLORS[np.clip(np.asarray(fdr_values, dtype=int), 0, 5)]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_fdr_trend_figure(fixtures_df):
+    """Fixture difficulty trend line, returned as a cacheable figure dict"""
+    fig = go.Figure()
+    
+    # Add line with markers
+    fig.add_trace(go.Scattergl(
+        x=fixtures_df['GW'],
+        y=fixtures_df['FDR'],
+        mode='lines+markers',
+        name='FDR',
+        line=dict(color='#3498db', width=3),
+        marker=dict(
+            size=10,
+            color=get_fdr_colors(fixtures_df['FDR']),
+            line=dict(color='white', width=1)
+        ),
+        text=fixtures_df['OPP'],
+        hovertemplate='<b>GW%{x}</b><br>' +
+                     'vs %{text}<br>' +
+                     'FDR: %{y:.2f}<br>' +
+                     '<extra></extra>'
+    ))
+    
+    # Add difficulty zone lines
+    fig.add_hline(
+        y=2.5,
+        line_dash="dash",
+        line_color="#40E0D0",
+        line_width=2,
+        annotation_text="Easy/Medium",
+        annotation_position="right"
+    )
+    
+    fig.add_hline(
+        y=3.5,
+        line_dash="dash",
+        line_color="#FF69B4",
+        line_width=2,
+        annotation_text="Medium/Hard",
+        annotation_position="right"
+    )
+    
+    fig.update_layout(
+        xaxis_title="Gameweek",
+        yaxis_title="Fixture Difficulty Rating",
+        yaxis=dict(range=[1, 5]),
+        height=400,
+        showlegend=False,
+        hovermode='x'
+    )
+    
+    return fig.to_dict()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_fixtures_html(fixtures_df):
+    """Fixtures table rendered once to HTML, FDR cells coloured, in a scrollable container"""
+    # Plain HTML with inline styles - only the FDR column is colored
+    header = ''.join(f'<th>{col}</th>' for col in fixtures_df.columns)
+    fdr_cell_styles = 'background-color: ' + get_fdr_colors(fixtures_df['FDR']) + '; color: black; font-weight: bold'
+    rows = ''.join(
+        f'<tr><td>{gw}</td><td>{escape(opp)}</td><td style="{style}">{fdr}</td></tr>'
+        for gw, opp, fdr, style in zip(fixtures_df['GW'], fixtures_df['OPP'], fixtures_df['FDR'], fdr_cell_styles)
+    )
+    
+    return (
+        '<div style="max-height: 600px; overflow-y: auto;">'
+        '<table style="width: 100%; text-align: center;">'
+        f'<thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table></div>'
+    )
+
+def _cat_mask(series, value):
+    """Boolean mask for series == value, comparing integer codes when the column is categorical"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if value not in categories:
+            return np.zeros(len(series), dtype=bool)
+        return series.cat.codes.to_numpy() == categories.get_loc(value)
+    return series.to_numpy() == value
+
 def format_opponent_display(opponent, was_home):
     """Format opponent display with (H) or (A) suffix"""
     if pd.isna(opponent) or opponent == '':
         return 'N/A'
     
-    # Handle was_home being various types
-    if pd.isna(was_home):
-        suffix = "(H)"  # Default to home
-    elif isinstance(was_home, bool):
-        suffix = "(H)" if was_home else "(A)"
-    elif isinstance(was_home, (int, float)):
-        suffix = "(H)" if was_home == 1 or was_home == True else "(A)"
-    else:
-        suffix = "(H)"  # Default to home if unclear
+    # Missing venue defaults to home; bools and 0/1 flags both coerce cleanly
+    suffix = "(H)" if pd.isna(was_home) or bool(was_home) else "(A)"
     
     return f"{opponent} {suffix}"
 
+def format_opponent_column(df, opponent_col):
+    """Vectorized format_opponent_display over a whole frame, returns an array of labels"""
+    opponents = df[opponent_col]
+    
+    if 'was_home' in df.columns:
+        is_home = df['was_home'].fillna(True).astype(bool).to_numpy()
+    else:
+        is_home = np.ones(len(df), dtype=bool)
+    
+    return np.where(
+        opponents.isna() | (opponents == ''),
+        'N/A',
+        opponents.astype(str).to_numpy() + np.where(is_home, ' (H)', ' (A)')
+    )
+
 def create_enhanced_tooltip(row):
     """Create enhanced tooltip text with match details"""
     # Determine which opponent column exists
@@ -113,36 +339,63 @@ def create_enhanced_tooltip(row):
     tooltip += f"Minutes: {int(row['minutes'])}<br>"
     return tooltip
 
-def show_performance_trends_enhanced(chart_df, player_position):
-    """Show enhanced performance trends with multiple visualizations including cumulative plots"""
-    
-    st.markdown("---")
-    st.markdown("#### 📊 Performance Trends")
-    
-    # Prepare data - ensure proper sorting and numeric types
-    chart_df = chart_df.copy()
-    chart_df = chart_df.sort_values('round')
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_perf_figure(chart_df, player_position):
+    """
+    Prepare the match data and build the performance trend figure.
+    The figure is returned as a plain dict so Streamlit can cache it; reruns
+    for the same player skip the pandas prep and the Plotly construction.
+    """
+    # Only needed when the figure is rebuilt, so imported here rather than at page load
+    from plotly.subplots import make_subplots
     
-    # Ensure numeric types
     numeric_cols = ['round', 'total_points', 'goals_scored', 'assists', 'expected_goals', 
                    'expected_assists', 'expected_goal_involvements', 'defensive_contribution',
                    'goals_conceded', 'expected_goals_conceded', 'minutes']
     
+    # Prepare data - copy only the columns the charts use, sorted by gameweek
+    needed_cols = numeric_cols + ['opponent_short', 'opponent_team_short', 'opponent_team', 'was_home']
+    chart_df = chart_df[[c for c in needed_cols if c in chart_df.columns]]
+    
+    # Player matches arrive newest first from the loader, so reversing them is enough
+    if chart_df['round'].is_monotonic_decreasing:
+        chart_df = chart_df.iloc[::-1]
+    else:
+        chart_df = chart_df.sort_values('round')
+    
+    # Ensure numeric types
     for col in numeric_cols:
         if col in chart_df.columns:
             chart_df[col] = pd.to_numeric(chart_df[col], errors='coerce').fillna(0)
     
-    # Calculate cumulative metrics
-    chart_df['cum_goals'] = chart_df['goals_scored'].cumsum()
-    chart_df['cum_assists'] = chart_df['assists'].cumsum()
-    chart_df['cum_goal_involvements'] = (chart_df['goals_scored'] + chart_df['assists']).cumsum()
-    chart_df['cum_xG'] = chart_df['expected_goals'].cumsum()
-    chart_df['cum_xA'] = chart_df['expected_assists'].cumsum()
-    chart_df['cum_xGI'] = chart_df['expected_goal_involvements'].cumsum()
+    # Narrow dtypes so the serialized figure carries half the bytes per point
+    float_cols = [c for c in numeric_cols if c in chart_df.columns and c not in ('round', 'minutes')]
+    chart_df[float_cols] = chart_df[float_cols].astype(np.float32)
+    chart_df[['round', 'minutes']] = chart_df[['round', 'minutes']].astype(np.int16)
+    
+    # Color bars based on DC threshold by position (per game, not per 90)
+    dc_threshold = _DC_THRESHOLDS.get(player_position, 10)
+    
+    # Calculate cumulative metrics and DC hits in one pass
+    cum_sources = ['goals_scored', 'assists', 'expected_goals',
+                   'expected_assists', 'expected_goal_involvements']
+    cum_names = ['cum_goals', 'cum_assists', 'cum_xG', 'cum_xA', 'cum_xGI']
     
     if player_position in ['GKP', 'DEF']:
-        chart_df['cum_goals_conceded'] = chart_df['goals_conceded'].cumsum()
-        chart_df['cum_xGC'] = chart_df['expected_goals_conceded'].cumsum()
+        cum_sources += ['goals_conceded', 'expected_goals_conceded']
+        cum_names += ['cum_goals_conceded', 'cum_xGC']
+    
+    # Minutes as int32 once: feeds the DC count and every trace's hover text
+    minutes = chart_df['minutes'].to_numpy(dtype=np.int32)
+    
+    # Plain vectorised NumPy over at most one season - numba is not a dependency
+    cum = np.cumsum(chart_df[cum_sources].to_numpy(dtype=np.float64), axis=0)
+    played = minutes > 0
+    dc_hits = int(np.count_nonzero((chart_df['defensive_contribution'].to_numpy() >= dc_threshold) & played))
+    n_played = int(np.count_nonzero(played))
+    cum_df = pd.DataFrame(cum, columns=cum_names, index=chart_df.index)
+    cum_df['cum_goal_involvements'] = cum[:, 0] + cum[:, 1]
+    chart_df = pd.concat([chart_df, cum_df], axis=1)
     
     # Add opponent display
     opponent_col = None
@@ -152,530 +405,434 @@ def show_performance_trends_enhanced(chart_df, player_position):
             break
     
     if opponent_col:
-        chart_df['opponent_display'] = chart_df.apply(
-            lambda row: format_opponent_display(row[opponent_col], row.get('was_home', True)),
-            axis=1
-        )
+        chart_df['opponent_display'] = format_opponent_column(chart_df, opponent_col)
     else:
-        chart_df['opponent_display'] = chart_df['round'].apply(lambda x: f"GW{int(x)}")
+        chart_df['opponent_display'] = 'GW' + chart_df['round'].astype(str)
     
-    # Row 1: FPL Points
-    st.markdown("##### 🎯 FPL Points by Gameweek")
+    # DC hit percentage (% of games where they met/exceeded threshold)
+    dc_hit_percentage = (dc_hits / n_played) * 100 if n_played else 0
     
-    fig = go.Figure()
+    threshold_label = f"{player_position}: ≥{dc_threshold} DC"
+    
+    has_gc = player_position in ['GKP', 'DEF']
+    
+    # Arrays shared by every trace, converted once
+    rounds = chart_df['round'].to_numpy()
+    opponent_display = chart_df['opponent_display'].to_numpy()
+    
+    # Single figure for every panel: one Plotly mount instead of ten
+    fig = make_subplots(
+        rows=6, cols=2,
+        specs=[[{'colspan': 2}, None]] + [[{}, {}] for _ in range(5)],
+        subplot_titles=(
+            'FPL Points by Gameweek',
+            'Goals + Assists', 'Goals + Assists vs xGI',
+            'Goals vs xG', 'Assists vs xA',
+            f'Defensive Contributions (Highlight: {threshold_label})',
+            'Goals Conceded vs xGC' if has_gc else '',
+            'Cumulative: Goals + Assists vs xGI', 'Cumulative: Goals vs xG',
+            'Cumulative: Assists vs xA',
+            'Cumulative: Goals Conceded vs xGC' if has_gc else ''
+        ),
+        shared_xaxes=True,
+        vertical_spacing=0.06
+    )
     
-    fig.add_trace(go.Scatter(
-        x=chart_df['round'],
+    # Row 1: FPL Points
+    fig.add_trace(go.Scattergl(
+        x=rounds,
         y=chart_df['total_points'],
         mode='lines+markers',
         name='FPL Points',
+        legendgroup='points',
+        legendgrouptitle_text='FPL Points',
         line=dict(color='#3498db', width=3),
         marker=dict(size=8),
         hovertemplate='<b>%{customdata}</b><br>' +
                      'Minutes: %{text}<br>' +
                      'Points: %{y}<br>' +
                      '<extra></extra>',
-        customdata=chart_df['opponent_display'],
-        text=chart_df['minutes'].astype(int)
-    ))
-    
-    fig.update_layout(
-        xaxis_title='Gameweek',
-        yaxis_title='Points',
-        height=300,
-        hovermode='closest'
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+        customdata=opponent_display,
+        text=minutes
+    ), row=1, col=1)
     
     # Row 2: Goal Contributions
-    st.markdown("##### ⚽ Goal Contributions")
-    
-    col1, col2 = st.columns(2)
+    # Goals
+    fig.add_trace(go.Bar(
+        x=rounds,
+        y=chart_df['goals_scored'],
+        name='Goals',
+        legendgroup='goal_contributions',
+        legendgrouptitle_text='Goals + Assists',
+        marker_color='#e74c3c',
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'Goals: %{y}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=2, col=1)
+    
+    # Assists
+    fig.add_trace(go.Bar(
+        x=rounds,
+        y=chart_df['assists'],
+        name='Assists',
+        legendgroup='goal_contributions',
+        marker_color='#3498db',
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'Assists: %{y}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=2, col=1)
+    
+    # Goal Involvements (Goals + Assists)
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['goals_scored'] + chart_df['assists'],
+        mode='lines+markers',
+        name='Goals + Assists',
+        legendgroup='ga_vs_xgi',
+        legendgrouptitle_text='Goals + Assists vs xGI',
+        line=dict(color='#e74c3c', width=3),
+        marker=dict(size=8),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'G+A: %{y}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=2, col=2)
+    
+    # xGI
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['expected_goal_involvements'],
+        mode='lines+markers',
+        name='xGI',
+        legendgroup='ga_vs_xgi',
+        line=dict(color='#95a5a6', width=2, dash='dash'),
+        marker=dict(size=6),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'xGI: %{y:.2f}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=2, col=2)
     
-    with col1:
-        fig = go.Figure()
-        
-        # Goals
-        fig.add_trace(go.Bar(
-            x=chart_df['round'],
-            y=chart_df['goals_scored'],
-            name='Goals',
-            marker_color='#e74c3c',
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Minutes: %{text}<br>' +
-                         'Goals: %{y}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
-        
-        # Assists
-        fig.add_trace(go.Bar(
-            x=chart_df['round'],
-            y=chart_df['assists'],
-            name='Assists',
-            marker_color='#3498db',
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Minutes: %{text}<br>' +
-                         'Assists: %{y}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
-        
-        fig.update_layout(
-            title='Goals + Assists',
-            xaxis_title='Gameweek',
-            yaxis_title='Count',
-            height=350,
-            barmode='stack',
-            hovermode='closest',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    # Row 3: Goals vs xG and Assists vs xA
+    # Actual Goals
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['goals_scored'],
+        mode='lines+markers',
+        name='Goals',
+        legendgroup='goals_vs_xg',
+        legendgrouptitle_text='Goals vs xG',
+        line=dict(color='#e74c3c', width=3),
+        marker=dict(size=8),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'Goals: %{y}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=3, col=1)
+    
+    # xG
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['expected_goals'],
+        mode='lines+markers',
+        name='xG',
+        legendgroup='goals_vs_xg',
+        line=dict(color='#95a5a6', width=2, dash='dash'),
+        marker=dict(size=6),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'xG: %{y:.2f}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=3, col=1)
+    
+    # Actual Assists
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['assists'],
+        mode='lines+markers',
+        name='Assists',
+        legendgroup='assists_vs_xa',
+        legendgrouptitle_text='Assists vs xA',
+        line=dict(color='#3498db', width=3),
+        marker=dict(size=8),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'Assists: %{y}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=3, col=2)
+    
+    # xA
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['expected_assists'],
+        mode='lines+markers',
+        name='xA',
+        legendgroup='assists_vs_xa',
+        line=dict(color='#95a5a6', width=2, dash='dash'),
+        marker=dict(size=6),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'xA: %{y:.2f}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=3, col=2)
     
-    with col2:
-        fig = go.Figure()
-        
-        # Goal Involvements (Goals + Assists)
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['goals_scored'] + chart_df['assists'],
-            mode='lines+markers',
-            name='Goals + Assists',
-            line=dict(color='#e74c3c', width=3),
-            marker=dict(size=8),
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Minutes: %{text}<br>' +
-                         'G+A: %{y}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
-        
-        # xGI
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['expected_goal_involvements'],
-            mode='lines+markers',
-            name='xGI',
-            line=dict(color='#95a5a6', width=2, dash='dash'),
-            marker=dict(size=6),
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Minutes: %{text}<br>' +
-                         'xGI: %{y:.2f}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
-        
-        fig.update_layout(
-            title='Goals + Assists vs xGI',
-            xaxis_title='Gameweek',
-            yaxis_title='Count',
-            height=350,
-            hovermode='closest',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    # Row 4: Defensive Contributions (for all players, but highlight for DEF)
+    # Color bars: green if >= threshold, red if below
+    colors = ['#2ecc71' if val >= dc_threshold else '#e74c3c' 
+             for val in chart_df['defensive_contribution']]
     
-    # Row 3: Goals vs xG and Assists vs xA
-    col1, col2 = st.columns(2)
+    fig.add_trace(go.Bar(
+        x=rounds,
+        y=chart_df['defensive_contribution'],
+        name='Defensive Contributions',
+        legendgroup='dc',
+        legendgrouptitle_text='Defensive Contributions',
+        marker_color=colors,
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Minutes: %{text}<br>' +
+                     'DC: %{y:.0f}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display,
+        text=minutes
+    ), row=4, col=1)
+    
+    # Add threshold line
+    fig.add_hline(
+        y=dc_threshold, 
+        line_dash="dash", 
+        line_color="gray",
+        annotation_text=f"Threshold: {dc_threshold}",
+        annotation_position="right",
+        row=4, col=1
+    )
     
-    with col1:
-        fig = go.Figure()
-        
-        # Actual Goals
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['goals_scored'],
+    # Goals Conceded vs xGC (for GKP and DEF only)
+    if has_gc:
+        # Actual Goals Conceded
+        fig.add_trace(go.Scattergl(
+            x=rounds,
+            y=chart_df['goals_conceded'],
             mode='lines+markers',
-            name='Goals',
+            name='Goals Conceded',
+            legendgroup='gc_vs_xgc',
+            legendgrouptitle_text='Goals Conceded vs xGC',
             line=dict(color='#e74c3c', width=3),
             marker=dict(size=8),
             hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
                          'Minutes: %{text}<br>' +
-                         'Goals: %{y}<br>' +
+                         'GC: %{y}<br>' +
                          '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
+            customdata=opponent_display,
+            text=minutes
+        ), row=4, col=2)
         
-        # xG
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['expected_goals'],
+        # xGC
+        fig.add_trace(go.Scattergl(
+            x=rounds,
+            y=chart_df['expected_goals_conceded'],
             mode='lines+markers',
-            name='xG',
+            name='xGC',
+            legendgroup='gc_vs_xgc',
             line=dict(color='#95a5a6', width=2, dash='dash'),
             marker=dict(size=6),
             hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
                          'Minutes: %{text}<br>' +
-                         'xG: %{y:.2f}<br>' +
+                         'xGC: %{y:.2f}<br>' +
                          '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
-        
-        fig.update_layout(
-            title='Goals vs xG',
-            xaxis_title='Gameweek',
-            yaxis_title='Count',
-            height=350,
-            hovermode='closest',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
+            customdata=opponent_display,
+            text=minutes
+        ), row=4, col=2)
         
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        fig = go.Figure()
-        
-        # Actual Assists
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['assists'],
-            mode='lines+markers',
-            name='Assists',
-            line=dict(color='#3498db', width=3),
-            marker=dict(size=8),
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Minutes: %{text}<br>' +
-                         'Assists: %{y}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
-        
-        # xA
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['expected_assists'],
-            mode='lines+markers',
-            name='xA',
-            line=dict(color='#95a5a6', width=2, dash='dash'),
-            marker=dict(size=6),
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Minutes: %{text}<br>' +
-                         'xA: %{y:.2f}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
-        
-        fig.update_layout(
-            title='Assists vs xA',
-            xaxis_title='Gameweek',
-            yaxis_title='Count',
-            height=350,
-            hovermode='closest',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Row 4: Defensive Contributions (for all players, but highlight for DEF)
-    st.markdown("##### 🛡️ Defensive Metrics")
-    
-    # Color bars based on DC threshold by position (per game, not per 90)
-    dc_thresholds = {
-        'GKP': 10,
-        'DEF': 10,
-        'MID': 12,
-        'FWD': 12
-    }
-    
-    dc_threshold = dc_thresholds.get(player_position, 10)
-    
-    # Calculate DC hit percentage (% of games where they met/exceeded threshold)
-    games_with_minutes = chart_df[chart_df['minutes'] > 0]
-    if len(games_with_minutes) > 0:
-        dc_hits = len(games_with_minutes[games_with_minutes['defensive_contribution'] >= dc_threshold])
-        dc_hit_percentage = (dc_hits / len(games_with_minutes)) * 100
-    else:
-        dc_hit_percentage = 0
-    
-    threshold_label = f"{player_position}: ≥{dc_threshold} DC"
-    
-    # Color bars: green if >= threshold, red if below
-    colors = ['#2ecc71' if val >= dc_threshold else '#e74c3c' 
-             for val in chart_df['defensive_contribution']]
+    # === NEW: CUMULATIVE PLOTS ===
+    # Row 5: Cumulative xGI vs G+A and Cumulative xG vs Goals
+    # Cumulative Goals + Assists
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['cum_goal_involvements'],
+        mode='lines+markers',
+        name='Cumulative G+A',
+        legendgroup='cum_ga_vs_xgi',
+        legendgrouptitle_text='Cumulative: Goals + Assists vs xGI',
+        line=dict(color='#e74c3c', width=3),
+        marker=dict(size=8),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Cumulative G+A: %{y}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display
+    ), row=5, col=1)
     
-    col1, col2 = st.columns(2)
+    # Cumulative xGI
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['cum_xGI'],
+        mode='lines+markers',
+        name='Cumulative xGI',
+        legendgroup='cum_ga_vs_xgi',
+        line=dict(color='#95a5a6', width=2, dash='dash'),
+        marker=dict(size=6),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Cumulative xGI: %{y:.2f}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display
+    ), row=5, col=1)
     
-    with col1:
-        # Display DC hit percentage metric above the chart
-        st.metric(
-            "DC % Hit", 
-            f"{dc_hit_percentage:.1f}%",
-            help=f"Percentage of games with {dc_threshold}+ defensive contributions"
-        )
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=chart_df['round'],
-            y=chart_df['defensive_contribution'],
-            name='Defensive Contributions',
-            marker_color=colors,
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Minutes: %{text}<br>' +
-                         'DC: %{y}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display'],
-            text=chart_df['minutes'].astype(int)
-        ))
-        
-        # Add threshold line
-        fig.add_hline(
-            y=dc_threshold, 
-            line_dash="dash", 
-            line_color="gray",
-            annotation_text=f"Threshold: {dc_threshold}",
-            annotation_position="right"
-        )
-        
-        fig.update_layout(
-            title=f'Defensive Contributions (Highlight: {threshold_label})',
-            xaxis_title='Gameweek',
-            yaxis_title='DC',
-            height=350,
-            hovermode='closest',
-            showlegend=False
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    # Cumulative Goals
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['cum_goals'],
+        mode='lines+markers',
+        name='Cumulative Goals',
+        legendgroup='cum_goals_vs_xg',
+        legendgrouptitle_text='Cumulative: Goals vs xG',
+        line=dict(color='#e74c3c', width=3),
+        marker=dict(size=8),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Cumulative Goals: %{y}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display
+    ), row=5, col=2)
     
-    # Goals Conceded vs xGC (for GKP and DEF only)
-    if player_position in ['GKP', 'DEF']:
-        with col2:
-            fig = go.Figure()
-            
-            # Actual Goals Conceded
-            fig.add_trace(go.Scatter(
-                x=chart_df['round'],
-                y=chart_df['goals_conceded'],
-                mode='lines+markers',
-                name='Goals Conceded',
-                line=dict(color='#e74c3c', width=3),
-                marker=dict(size=8),
-                hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                             'Minutes: %{text}<br>' +
-                             'GC: %{y}<br>' +
-                             '<extra></extra>',
-                customdata=chart_df['opponent_display'],
-                text=chart_df['minutes'].astype(int)
-            ))
-            
-            # xGC
-            fig.add_trace(go.Scatter(
-                x=chart_df['round'],
-                y=chart_df['expected_goals_conceded'],
-                mode='lines+markers',
-                name='xGC',
-                line=dict(color='#95a5a6', width=2, dash='dash'),
-                marker=dict(size=6),
-                hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                             'Minutes: %{text}<br>' +
-                             'xGC: %{y:.2f}<br>' +
-                             '<extra></extra>',
-                customdata=chart_df['opponent_display'],
-                text=chart_df['minutes'].astype(int)
-            ))
-            
-            fig.update_layout(
-                title='Goals Conceded vs xGC',
-                xaxis_title='Gameweek',
-                yaxis_title='Count',
-                height=350,
-                hovermode='closest',
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+    # Cumulative xG
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['cum_xG'],
+        mode='lines+markers',
+        name='Cumulative xG',
+        legendgroup='cum_goals_vs_xg',
+        line=dict(color='#95a5a6', width=2, dash='dash'),
+        marker=dict(size=6),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Cumulative xG: %{y:.2f}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display
+    ), row=5, col=2)
     
-    # === NEW: CUMULATIVE PLOTS ===
-    st.markdown("---")
-    st.markdown("#### 📈 Cumulative Performance - Expected vs Actual")
+    # Row 6: Cumulative xA vs Assists and (for GKP/DEF) Cumulative xGC vs Goals Conceded
+    # Cumulative Assists
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['cum_assists'],
+        mode='lines+markers',
+        name='Cumulative Assists',
+        legendgroup='cum_assists_vs_xa',
+        legendgrouptitle_text='Cumulative: Assists vs xA',
+        line=dict(color='#3498db', width=3),
+        marker=dict(size=8),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Cumulative Assists: %{y}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display
+    ), row=6, col=1)
     
-    # Row 5: Cumulative xGI vs G+A and Cumulative xG vs Goals
-    col1, col2 = st.columns(2)
+    # Cumulative xA
+    fig.add_trace(go.Scattergl(
+        x=rounds,
+        y=chart_df['cum_xA'],
+        mode='lines+markers',
+        name='Cumulative xA',
+        legendgroup='cum_assists_vs_xa',
+        line=dict(color='#95a5a6', width=2, dash='dash'),
+        marker=dict(size=6),
+        hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
+                     'Cumulative xA: %{y:.2f}<br>' +
+                     '<extra></extra>',
+        customdata=opponent_display
+    ), row=6, col=1)
     
-    with col1:
-        fig = go.Figure()
-        
-        # Cumulative Goals + Assists
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['cum_goal_involvements'],
+    # Cumulative xGC vs Goals Conceded (for GKP/DEF only)
+    if has_gc:
+        # Cumulative Goals Conceded
+        fig.add_trace(go.Scattergl(
+            x=rounds,
+            y=chart_df['cum_goals_conceded'],
             mode='lines+markers',
-            name='Cumulative G+A',
+            name='Cumulative GC',
+            legendgroup='cum_gc_vs_xgc',
+            legendgrouptitle_text='Cumulative: Goals Conceded vs xGC',
             line=dict(color='#e74c3c', width=3),
             marker=dict(size=8),
             hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Cumulative G+A: %{y}<br>' +
+                         'Cumulative GC: %{y}<br>' +
                          '<extra></extra>',
-            customdata=chart_df['opponent_display']
-        ))
+            customdata=opponent_display
+        ), row=6, col=2)
         
-        # Cumulative xGI
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['cum_xGI'],
+        # Cumulative xGC
+        fig.add_trace(go.Scattergl(
+            x=rounds,
+            y=chart_df['cum_xGC'],
             mode='lines+markers',
-            name='Cumulative xGI',
+            name='Cumulative xGC',
+            legendgroup='cum_gc_vs_xgc',
             line=dict(color='#95a5a6', width=2, dash='dash'),
             marker=dict(size=6),
             hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Cumulative xGI: %{y:.2f}<br>' +
+                         'Cumulative xGC: %{y:.2f}<br>' +
                          '<extra></extra>',
-            customdata=chart_df['opponent_display']
-        ))
-        
-        fig.update_layout(
-            title='Cumulative: Goals + Assists vs xGI',
-            xaxis_title='Gameweek',
-            yaxis_title='Cumulative Count',
-            height=350,
-            hovermode='closest',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+            customdata=opponent_display
+        ), row=6, col=2)
+    
+    # Axis titles per panel (the GKP/DEF-only panels stay blank otherwise)
+    y_titles = [(1, 1, 'Points'), (2, 1, 'Count'), (2, 2, 'Count'),
+                (3, 1, 'Count'), (3, 2, 'Count'), (4, 1, 'DC'),
+                (5, 1, 'Cumulative Count'), (5, 2, 'Cumulative Count'),
+                (6, 1, 'Cumulative Count')]
+    if has_gc:
+        y_titles += [(4, 2, 'Count'), (6, 2, 'Cumulative Count')]
+    
+    for row, col, title in y_titles:
+        fig.update_yaxes(title_text=title, row=row, col=col)
+    fig.update_xaxes(title_text='Gameweek', row=6)
+    
+    # Stable uirevision keeps zoom/legend state and skips a full re-layout on reruns
+    fig.update_layout(
+        height=350 * 6,
+        barmode='stack',
+        hovermode='x unified',
+        uirevision='player_detail',
+        legend=dict(groupclick='toggleitem')
+    )
     
-    with col2:
-        fig = go.Figure()
-        
-        # Cumulative Goals
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['cum_goals'],
-            mode='lines+markers',
-            name='Cumulative Goals',
-            line=dict(color='#e74c3c', width=3),
-            marker=dict(size=8),
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Cumulative Goals: %{y}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display']
-        ))
-        
-        # Cumulative xG
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['cum_xG'],
-            mode='lines+markers',
-            name='Cumulative xG',
-            line=dict(color='#95a5a6', width=2, dash='dash'),
-            marker=dict(size=6),
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Cumulative xG: %{y:.2f}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display']
-        ))
-        
-        fig.update_layout(
-            title='Cumulative: Goals vs xG',
-            xaxis_title='Gameweek',
-            yaxis_title='Cumulative Count',
-            height=350,
-            hovermode='closest',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    return fig.to_dict(), dc_threshold, dc_hit_percentage
+
+def show_performance_trends_enhanced(chart_df, player_position):
+    """Show enhanced performance trends with multiple visualizations including cumulative plots"""
     
-    # Row 6: Cumulative xA vs Assists and (for GKP/DEF) Cumulative xGC vs Goals Conceded
-    col1, col2 = st.columns(2)
+    st.markdown("---")
+    st.markdown("#### 📊 Performance Trends")
     
-    with col1:
-        fig = go.Figure()
-        
-        # Cumulative Assists
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['cum_assists'],
-            mode='lines+markers',
-            name='Cumulative Assists',
-            line=dict(color='#3498db', width=3),
-            marker=dict(size=8),
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Cumulative Assists: %{y}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display']
-        ))
-        
-        # Cumulative xA
-        fig.add_trace(go.Scatter(
-            x=chart_df['round'],
-            y=chart_df['cum_xA'],
-            mode='lines+markers',
-            name='Cumulative xA',
-            line=dict(color='#95a5a6', width=2, dash='dash'),
-            marker=dict(size=6),
-            hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                         'Cumulative xA: %{y:.2f}<br>' +
-                         '<extra></extra>',
-            customdata=chart_df['opponent_display']
-        ))
-        
-        fig.update_layout(
-            title='Cumulative: Assists vs xA',
-            xaxis_title='Gameweek',
-            yaxis_title='Cumulative Count',
-            height=350,
-            hovermode='closest',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    # Nothing to plot for players without minutes - skip building the figure
+    if chart_df.empty or chart_df['minutes'].sum() == 0:
+        st.info("No match data to visualize.")
+        return
     
-    # Cumulative xGC vs Goals Conceded (for GKP/DEF only)
-    if player_position in ['GKP', 'DEF']:
-        with col2:
-            fig = go.Figure()
-            
-            # Cumulative Goals Conceded
-            fig.add_trace(go.Scatter(
-                x=chart_df['round'],
-                y=chart_df['cum_goals_conceded'],
-                mode='lines+markers',
-                name='Cumulative GC',
-                line=dict(color='#e74c3c', width=3),
-                marker=dict(size=8),
-                hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                             'Cumulative GC: %{y}<br>' +
-                             '<extra></extra>',
-                customdata=chart_df['opponent_display']
-            ))
-            
-            # Cumulative xGC
-            fig.add_trace(go.Scatter(
-                x=chart_df['round'],
-                y=chart_df['cum_xGC'],
-                mode='lines+markers',
-                name='Cumulative xGC',
-                line=dict(color='#95a5a6', width=2, dash='dash'),
-                marker=dict(size=6),
-                hovertemplate='<b>GW%{x}: %{customdata}</b><br>' +
-                             'Cumulative xGC: %{y:.2f}<br>' +
-                             '<extra></extra>',
-                customdata=chart_df['opponent_display']
-            ))
-            
-            fig.update_layout(
-                title='Cumulative: Goals Conceded vs xGC',
-                xaxis_title='Gameweek',
-                yaxis_title='Cumulative Count',
-                height=350,
-                hovermode='closest',
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+    fig, dc_threshold, dc_hit_percentage = _build_perf_figure(chart_df, player_position)
+    
+    st.metric(
+        "DC % Hit", 
+        f"{dc_hit_percentage:.1f}%",
+        help=f"Percentage of games with {dc_threshold}+ defensive contributions"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
 
 def show_player_overview(player_info, recent_matches):
     """Show player overview with stats and upcoming fixtures"""
@@ -688,17 +845,19 @@ def show_player_overview(player_info, recent_matches):
         st.markdown(f"**Position:** {player_info['position']}")
         st.markdown(f"**Team:** {player_info['team']}")
     
-    with col2:
-        st.metric("Total Points", f"{player_info['total_points']:.0f}")
-        st.metric("Price", f"£{player_info['price']:.1f}m")
-    
-    with col3:
-        st.metric("Pts/90 (Season)", f"{player_info.get('points_per90_season', 0):.2f}")
-        st.metric("xGI/90 (Season)", f"{player_info.get('xGI_per90_season', 0):.2f}")
+    # Headline metrics, two per column
+    header_metrics = [
+        [("Total Points", f"{player_info['total_points']:.0f}"),
+         ("Price", f"£{player_info['price']:.1f}m")],
+        [("Pts/90 (Season)", f"{player_info.get('points_per90_season', 0):.2f}"),
+         ("xGI/90 (Season)", f"{player_info.get('xGI_per90_season', 0):.2f}")],
+        [("Pts/90 (L5)", f"{player_info.get('points_per90_last_5', 0):.2f}"),
+         ("Form Trend", f"{player_info.get('form_trend_points', 0):+.2f}")],
+    ]
     
-    with col4:
-        st.metric("Pts/90 (L5)", f"{player_info.get('points_per90_last_5', 0):.2f}")
-        st.metric("Form Trend", f"{player_info.get('form_trend_points', 0):+.2f}")
+    for col, col_metrics in zip((col2, col3, col4), header_metrics):
+        for label, value in col_metrics:
+            col.metric(label, value)
     
     # === NEW: Additional Per 90 Metrics ===
     st.markdown("---")
@@ -749,96 +908,45 @@ def show_player_overview(player_info, recent_matches):
     if not player_qualifies:
         st.info(f"ℹ️ Rankings require {MIN_MINUTES_SEASON}+ minutes (≈10 games). This player has {total_minutes} minutes.")
     
-    col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
-    
-    with col1:
-        pts_per90 = player_info.get('points_per90_season', 0)
-        if player_qualifies:
-            overall_rank = get_rank(pts_per90, qualified_players['points_per90_season'])
-            pos_rank = get_rank(pts_per90, qualified_same_position['points_per90_season'])
-            rank_str = format_double_rank(overall_rank, len(qualified_players), pos_rank, len(qualified_same_position), player_position)
-            st.metric("Pts/90", f"{pts_per90:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("Pts/90", f"{pts_per90:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col2:
-        # Calculate goals per 90 season
-        total_goals = player_info.get('goals_scored', 0)
-        goals_per90 = (total_goals * 90 / total_minutes) if total_minutes > 0 else 0
-        if player_qualifies:
-            qualified_players_copy = qualified_players.copy()
-            qualified_players_copy['goals_per90_calc'] = (qualified_players_copy['goals_scored'] * 90 / qualified_players_copy['total_minutes'])
-            qualified_same_pos_copy = qualified_same_position.copy()
-            qualified_same_pos_copy['goals_per90_calc'] = (qualified_same_pos_copy['goals_scored'] * 90 / qualified_same_pos_copy['total_minutes'])
-            overall_rank = get_rank(goals_per90, qualified_players_copy['goals_per90_calc'])
-            pos_rank = get_rank(goals_per90, qualified_same_pos_copy['goals_per90_calc'])
-            rank_str = format_double_rank(overall_rank, len(qualified_players), pos_rank, len(qualified_same_position), player_position)
-            st.metric("G/90", f"{goals_per90:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("G/90", f"{goals_per90:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col3:
-        # Calculate assists per 90 season
-        total_assists = player_info.get('assists', 0)
-        assists_per90 = (total_assists * 90 / total_minutes) if total_minutes > 0 else 0
-        if player_qualifies:
-            qualified_players_copy['assists_per90_calc'] = (qualified_players_copy['assists'] * 90 / qualified_players_copy['total_minutes'])
-            qualified_same_pos_copy['assists_per90_calc'] = (qualified_same_pos_copy['assists'] * 90 / qualified_same_pos_copy['total_minutes'])
-            overall_rank = get_rank(assists_per90, qualified_players_copy['assists_per90_calc'])
-            pos_rank = get_rank(assists_per90, qualified_same_pos_copy['assists_per90_calc'])
-            rank_str = format_double_rank(overall_rank, len(qualified_players), pos_rank, len(qualified_same_position), player_position)
-            st.metric("A/90", f"{assists_per90:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("A/90", f"{assists_per90:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col4:
-        # Calculate xG/90 from total_xG
-        total_xg = player_info.get('total_xG', 0)
-        xg_per90 = (total_xg * 90 / total_minutes) if total_minutes > 0 else 0
-        if player_qualifies:
-            qualified_players_copy['xg_per90_calc'] = (qualified_players_copy['total_xG'] * 90 / qualified_players_copy['total_minutes'])
-            qualified_same_pos_copy['xg_per90_calc'] = (qualified_same_pos_copy['total_xG'] * 90 / qualified_same_pos_copy['total_minutes'])
-            overall_rank = get_rank(xg_per90, qualified_players_copy['xg_per90_calc'])
-            pos_rank = get_rank(xg_per90, qualified_same_pos_copy['xg_per90_calc'])
-            rank_str = format_double_rank(overall_rank, len(qualified_players), pos_rank, len(qualified_same_position), player_position)
-            st.metric("xG/90", f"{xg_per90:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("xG/90", f"{xg_per90:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col5:
-        # Calculate xA/90
-        total_xa = player_info.get('total_xA', 0)
-        xa_per90 = (total_xa * 90 / total_minutes) if total_minutes > 0 else 0
-        if player_qualifies:
-            qualified_players_copy['xa_per90_calc'] = (qualified_players_copy['total_xA'] * 90 / qualified_players_copy['total_minutes'])
-            qualified_same_pos_copy['xa_per90_calc'] = (qualified_same_pos_copy['total_xA'] * 90 / qualified_same_pos_copy['total_minutes'])
-            overall_rank = get_rank(xa_per90, qualified_players_copy['xa_per90_calc'])
-            pos_rank = get_rank(xa_per90, qualified_same_pos_copy['xa_per90_calc'])
-            rank_str = format_double_rank(overall_rank, len(qualified_players), pos_rank, len(qualified_same_position), player_position)
-            st.metric("xA/90", f"{xa_per90:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("xA/90", f"{xa_per90:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col6:
-        xgi_per90 = player_info.get('xGI_per90_season', 0)
-        if player_qualifies:
-            overall_rank = get_rank(xgi_per90, qualified_players['xGI_per90_season'])
-            pos_rank = get_rank(xgi_per90, qualified_same_position['xGI_per90_season'])
-            rank_str = format_double_rank(overall_rank, len(qualified_players), pos_rank, len(qualified_same_position), player_position)
-            st.metric("xGI/90", f"{xgi_per90:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("xGI/90", f"{xgi_per90:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col7:
-        # BPS per 90 season - calculate from player's match data
-        bps_per90 = player_info.get('bps_per90_season', 0)
-        if player_qualifies:
-            overall_rank = get_rank(bps_per90, qualified_players['bps_per90_season'])
-            pos_rank = get_rank(bps_per90, qualified_same_position['bps_per90_season'])
-            rank_str = format_double_rank(overall_rank, len(qualified_players), pos_rank, len(qualified_same_position), player_position)
-            st.metric("BPS/90", f"{bps_per90:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("BPS/90", f"{bps_per90:.2f}", delta="(Not ranked)", delta_color="off")
+    def per90(df, stat_col, minutes_col):
+        """Per 90 values of a stat for every player in df"""
+        return df[stat_col] * 90 / df[minutes_col]
+    
+    def build_ranked_metrics(specs, qualifies, overall_df, pos_df):
+        """Resolve (label, value, values_of) specs into (label, value, rank delta) for st.metric"""
+        metrics = []
+        for label, value, values_of in specs:
+            if qualifies:
+                overall_rank = get_rank(value, values_of(overall_df))
+                pos_rank = get_rank(value, values_of(pos_df))
+                delta = format_double_rank(overall_rank, len(overall_df), pos_rank, len(pos_df), player_position)
+            else:
+                delta = "(Not ranked)"
+            metrics.append((label, f"{value:.2f}", delta))
+        return metrics
+    
+    # Season values: goals, assists, xG and xA per 90 are derived from season totals
+    season_specs = [
+        ("Pts/90", player_info.get('points_per90_season', 0),
+         lambda df: df['points_per90_season']),
+        ("G/90", (player_info.get('goals_scored', 0) * 90 / total_minutes) if total_minutes > 0 else 0,
+         lambda df: per90(df, 'goals_scored', 'total_minutes')),
+        ("A/90", (player_info.get('assists', 0) * 90 / total_minutes) if total_minutes > 0 else 0,
+         lambda df: per90(df, 'assists', 'total_minutes')),
+        ("xG/90", (player_info.get('total_xG', 0) * 90 / total_minutes) if total_minutes > 0 else 0,
+         lambda df: per90(df, 'total_xG', 'total_minutes')),
+        ("xA/90", (player_info.get('total_xA', 0) * 90 / total_minutes) if total_minutes > 0 else 0,
+         lambda df: per90(df, 'total_xA', 'total_minutes')),
+        ("xGI/90", player_info.get('xGI_per90_season', 0),
+         lambda df: df['xGI_per90_season']),
+        ("BPS/90", player_info.get('bps_per90_season', 0),
+         lambda df: df['bps_per90_season']),
+    ]
+    season_metrics = build_ranked_metrics(season_specs, player_qualifies, qualified_players, qualified_same_position)
+    
+    # Render the whole row in one pass
+    for col, (label, value, delta) in zip(st.columns(len(season_metrics)), season_metrics):
+        col.metric(label, value, delta=delta, delta_color="off")
     
     # === NEW: Last 5 Games Per 90 Metrics (SAME AS SEASON) ===
     st.markdown("---")
@@ -857,91 +965,27 @@ def show_player_overview(player_info, recent_matches):
     if not player_qualifies_l5:
         st.info(f"ℹ️ Last 5 rankings require {MIN_MINUTES_LAST_5}+ minutes (≈2 games). This player has {minutes_l5} minutes in last 5.")
     
-    col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
-    
-    with col1:
-        pts_per90_l5 = player_info.get('points_per90_last_5', 0)
-        if player_qualifies_l5:
-            overall_rank = get_rank(pts_per90_l5, qualified_l5['points_per90_last_5'])
-            pos_rank = get_rank(pts_per90_l5, qualified_same_position_l5['points_per90_last_5'])
-            rank_str = format_double_rank(overall_rank, len(qualified_l5), pos_rank, len(qualified_same_position_l5), player_position)
-            st.metric("Pts/90", f"{pts_per90_l5:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("Pts/90", f"{pts_per90_l5:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col2:
-        # Calculate goals per 90 last 5
-        goals_l5 = player_info.get('goals_last_5', 0)
-        goals_per90_l5 = (goals_l5 * 90 / minutes_l5) if minutes_l5 > 0 else 0
-        if player_qualifies_l5:
-            qualified_l5_copy = qualified_l5.copy()
-            qualified_l5_copy['goals_per90_l5_calc'] = (qualified_l5_copy['goals_last_5'] * 90 / qualified_l5_copy['minutes_last_5'])
-            qualified_same_pos_l5_copy = qualified_same_position_l5.copy()
-            qualified_same_pos_l5_copy['goals_per90_l5_calc'] = (qualified_same_pos_l5_copy['goals_last_5'] * 90 / qualified_same_pos_l5_copy['minutes_last_5'])
-            overall_rank = get_rank(goals_per90_l5, qualified_l5_copy['goals_per90_l5_calc'])
-            pos_rank = get_rank(goals_per90_l5, qualified_same_pos_l5_copy['goals_per90_l5_calc'])
-            rank_str = format_double_rank(overall_rank, len(qualified_l5), pos_rank, len(qualified_same_position_l5), player_position)
-            st.metric("G/90", f"{goals_per90_l5:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("G/90", f"{goals_per90_l5:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col3:
-        # Calculate assists per 90 last 5
-        assists_l5 = player_info.get('assists_last_5', 0)
-        assists_per90_l5 = (assists_l5 * 90 / minutes_l5) if minutes_l5 > 0 else 0
-        if player_qualifies_l5:
-            qualified_l5_copy['assists_per90_l5_calc'] = (qualified_l5_copy['assists_last_5'] * 90 / qualified_l5_copy['minutes_last_5'])
-            qualified_same_pos_l5_copy['assists_per90_l5_calc'] = (qualified_same_pos_l5_copy['assists_last_5'] * 90 / qualified_same_pos_l5_copy['minutes_last_5'])
-            overall_rank = get_rank(assists_per90_l5, qualified_l5_copy['assists_per90_l5_calc'])
-            pos_rank = get_rank(assists_per90_l5, qualified_same_pos_l5_copy['assists_per90_l5_calc'])
-            rank_str = format_double_rank(overall_rank, len(qualified_l5), pos_rank, len(qualified_same_position_l5), player_position)
-            st.metric("A/90", f"{assists_per90_l5:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("A/90", f"{assists_per90_l5:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col4:
-        xg_per90_l5 = player_info.get('xG_per90_last_5', 0)
-        if player_qualifies_l5:
-            overall_rank = get_rank(xg_per90_l5, qualified_l5['xG_per90_last_5'])
-            pos_rank = get_rank(xg_per90_l5, qualified_same_position_l5['xG_per90_last_5'])
-            rank_str = format_double_rank(overall_rank, len(qualified_l5), pos_rank, len(qualified_same_position_l5), player_position)
-            st.metric("xG/90", f"{xg_per90_l5:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("xG/90", f"{xg_per90_l5:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col5:
-        xa_per90_l5 = player_info.get('xA_per90_last_5', 0)
-        if player_qualifies_l5:
-            overall_rank = get_rank(xa_per90_l5, qualified_l5['xA_per90_last_5'])
-            pos_rank = get_rank(xa_per90_l5, qualified_same_position_l5['xA_per90_last_5'])
-            rank_str = format_double_rank(overall_rank, len(qualified_l5), pos_rank, len(qualified_same_position_l5), player_position)
-            st.metric("xA/90", f"{xa_per90_l5:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("xA/90", f"{xa_per90_l5:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col6:
-        xgi_per90_l5 = player_info.get('xGI_per90_last_5', 0)
-        if player_qualifies_l5:
-            overall_rank = get_rank(xgi_per90_l5, qualified_l5['xGI_per90_last_5'])
-            pos_rank = get_rank(xgi_per90_l5, qualified_same_position_l5['xGI_per90_last_5'])
-            rank_str = format_double_rank(overall_rank, len(qualified_l5), pos_rank, len(qualified_same_position_l5), player_position)
-            st.metric("xGI/90", f"{xgi_per90_l5:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("xGI/90", f"{xgi_per90_l5:.2f}", delta="(Not ranked)", delta_color="off")
-    
-    with col7:
-        # BPS per 90 last 5
-        bps_l5 = player_info.get('bps_last_5', 0)
-        bps_per90_l5 = (bps_l5 * 90 / minutes_l5) if minutes_l5 > 0 else 0
-        if player_qualifies_l5:
-            qualified_l5_copy['bps_per90_l5_calc'] = (qualified_l5_copy['bps_last_5'] * 90 / qualified_l5_copy['minutes_last_5'])
-            qualified_same_pos_l5_copy['bps_per90_l5_calc'] = (qualified_same_pos_l5_copy['bps_last_5'] * 90 / qualified_same_pos_l5_copy['minutes_last_5'])
-            overall_rank = get_rank(bps_per90_l5, qualified_l5_copy['bps_per90_l5_calc'])
-            pos_rank = get_rank(bps_per90_l5, qualified_same_pos_l5_copy['bps_per90_l5_calc'])
-            rank_str = format_double_rank(overall_rank, len(qualified_l5), pos_rank, len(qualified_same_position_l5), player_position)
-            st.metric("BPS/90", f"{bps_per90_l5:.2f}", delta=rank_str, delta_color="off")
-        else:
-            st.metric("BPS/90", f"{bps_per90_l5:.2f}", delta="(Not ranked)", delta_color="off")
+    # Last 5 values: goals, assists and BPS per 90 are derived from last-5 totals
+    last5_specs = [
+        ("Pts/90", player_info.get('points_per90_last_5', 0),
+         lambda df: df['points_per90_last_5']),
+        ("G/90", (player_info.get('goals_last_5', 0) * 90 / minutes_l5) if minutes_l5 > 0 else 0,
+         lambda df: per90(df, 'goals_last_5', 'minutes_last_5')),
+        ("A/90", (player_info.get('assists_last_5', 0) * 90 / minutes_l5) if minutes_l5 > 0 else 0,
+         lambda df: per90(df, 'assists_last_5', 'minutes_last_5')),
+        ("xG/90", player_info.get('xG_per90_last_5', 0),
+         lambda df: df['xG_per90_last_5']),
+        ("xA/90", player_info.get('xA_per90_last_5', 0),
+         lambda df: df['xA_per90_last_5']),
+        ("xGI/90", player_info.get('xGI_per90_last_5', 0),
+         lambda df: df['xGI_per90_last_5']),
+        ("BPS/90", (player_info.get('bps_last_5', 0) * 90 / minutes_l5) if minutes_l5 > 0 else 0,
+         lambda df: per90(df, 'bps_last_5', 'minutes_last_5')),
+    ]
+    last5_metrics = build_ranked_metrics(last5_specs, player_qualifies_l5, qualified_l5, qualified_same_position_l5)
+    
+    for col, (label, value, delta) in zip(st.columns(len(last5_metrics)), last5_metrics):
+        col.metric(label, value, delta=delta, delta_color="off")
     
     # Add DC Hit % as a separate metric row
     if not recent_matches.empty:
@@ -950,20 +994,12 @@ def show_player_overview(player_info, recent_matches):
         
         # Calculate DC hit percentage
         player_position = player_info.get('position', 'MID')
-        dc_thresholds = {
-            'GKP': 10,
-            'DEF': 10,
-            'MID': 12,
-            'FWD': 12
-        }
-        dc_threshold = dc_thresholds.get(player_position, 10)
+        dc_threshold = _DC_THRESHOLDS.get(player_position, 10)
         
-        games_with_minutes = recent_matches[recent_matches['minutes'] > 0]
-        if len(games_with_minutes) > 0:
-            dc_hits = len(games_with_minutes[games_with_minutes['defensive_contribution'] >= dc_threshold])
-            dc_hit_percentage = (dc_hits / len(games_with_minutes)) * 100
-        else:
-            dc_hit_percentage = 0
+        played = recent_matches['minutes'].to_numpy() > 0
+        n_played = int(played.sum())
+        dc_hits = int(((recent_matches['defensive_contribution'].to_numpy() >= dc_threshold) & played).sum())
+        dc_hit_percentage = (dc_hits / n_played) * 100 if n_played else 0
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -981,7 +1017,7 @@ def show_player_overview(player_info, recent_matches):
         with col3:
             st.metric(
                 "Games Hit Target",
-                f"{dc_hits}/{len(games_with_minutes)}",
+                f"{dc_hits}/{n_played}",
                 help=f"Number of games reaching DC threshold"
             )
     
@@ -989,175 +1025,51 @@ def show_player_overview(player_info, recent_matches):
     st.markdown("---")
     st.markdown("#### 📅 Upcoming Fixtures")
     
-    if FixtureAnalyzer:
+    # Imported on first use rather than when the page module loads
+    try:
+        from utils.fixture_analyzer import get_fixture_analyzer
+    except ImportError:
+        get_fixture_analyzer = None
+    
+    if get_fixture_analyzer:
         try:
-            analyzer = FixtureAnalyzer()
-            analyzer.initialize()
+            analyzer = get_fixture_analyzer()
             
             team = player_info.get('team')
             
             if team:
                 # Get team ID
-                team_id = None
-                for tid, team_info in analyzer.teams.items():
-                    if team_info['name'] == team:
-                        team_id = tid
-                        break
+                team_id = analyzer.team_ids.get(team)
                 
                 if team_id:
-                    # Get ALL upcoming fixtures until GW38
-                    all_fixtures = analyzer.get_all_fixtures()
-                    
-                    # Filter for this team's upcoming fixtures
-                    team_fixtures = all_fixtures[
-                        (all_fixtures['finished'] == False) &
-                        ((all_fixtures['team_h'] == team_id) | (all_fixtures['team_a'] == team_id))
-                    ].sort_values('event').copy()
+                    # Get ALL upcoming fixtures until GW38 with their FDR
+                    fixtures_df = _compute_fixture_fdr_df(team_id)
                     
-                    if not team_fixtures.empty:
-                        fixture_list = []
+                    if not fixtures_df.empty:
+                        # Display summary metrics
+                        fdr_values = fixtures_df['FDR'].to_numpy()
                         
-                        for _, fixture in team_fixtures.iterrows():
-                            gw = int(fixture['event'])
-                            is_home = fixture['team_h'] == team_id
-                            
-                            if is_home:
-                                opponent_id = fixture['team_a']
-                                opponent = analyzer.teams[opponent_id]['short_name']
-                                venue = 'H'
-                                # For home games, use opponent's away strength and their difficulty rating
-                                opp_strength = analyzer.teams[opponent_id].get('strength_overall_away', 1000)
-                                fdr = fixture.get('team_h_difficulty', 3)
-                            else:
-                                opponent_id = fixture['team_h']
-                                opponent = analyzer.teams[opponent_id]['short_name']
-                                venue = 'A'
-                                # For away games, use opponent's home strength and their difficulty rating
-                                opp_strength = analyzer.teams[opponent_id].get('strength_overall_home', 1000)
-                                fdr = fixture.get('team_a_difficulty', 3)
-                            
-                            # If FPL difficulty is not available (=0), calculate from strength
-                            if fdr == 0 or pd.isna(fdr):
-                                # Normalize strength values (typically 1000-1400) to FDR scale (1-5)
-                                min_strength = 1000
-                                max_strength = 1400
-                                
-                                # Invert and scale to 1-5 range
-                                normalized = (opp_strength - min_strength) / (max_strength - min_strength)
-                                fdr = 1 + (normalized * 4)
-                                
-                                # Adjust for venue
-                                if is_home:
-                                    fdr = fdr * 0.85
-                                else:
-                                    fdr = fdr * 1.15
-                                
-                                # Clamp to 1-5 range
-                                fdr = max(1.0, min(5.0, fdr))
-                            
-                            fixture_list.append({
-                                'GW': gw,
-                                'OPP': f"{opponent} ({venue})",
-                                'FDR': int(round(float(fdr)))  # Integer FDR like in example
-                            })
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            avg_fdr = fdr_values.mean()
+                            st.metric("Avg FDR", f"{avg_fdr:.2f}")
+                        with col2:
+                            easy = int((fdr_values <= 2.5).sum())
+                            st.metric("Easy Fixtures", easy)
+                        with col3:
+                            hard = int((fdr_values >= 3.5).sum())
+                            st.metric("Hard Fixtures", hard)
                         
-                        if fixture_list:
-                            fixtures_df = pd.DataFrame(fixture_list)
-                            
-                            # Display summary metrics
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                avg_fdr = fixtures_df['FDR'].mean()
-                                st.metric("Avg FDR", f"{avg_fdr:.2f}")
-                            with col2:
-                                easy = len(fixtures_df[fixtures_df['FDR'] <= 2.5])
-                                st.metric("Easy Fixtures", easy)
-                            with col3:
-                                hard = len(fixtures_df[fixtures_df['FDR'] >= 3.5])
-                                st.metric("Hard Fixtures", hard)
-                            
-                            st.markdown("---")
-                            
-                            # Style only the FDR column with colors
-                            def color_fdr_column(val):
-                                """Apply background color only to FDR values"""
-                                try:
-                                    fdr = float(val)
-                                    color = get_fdr_color(fdr)
-                                    return f'background-color: {color}; color: black; font-weight: bold'
-                                except:
-                                    return ''
-                            
-                            # Apply styling only to FDR column
-                            styled_fixtures = fixtures_df.style.applymap(
-                                color_fdr_column,
-                                subset=['FDR']
-                            )
-                            
-                            # Scrollable table showing all fixtures until GW38
-                            st.dataframe(
-                                styled_fixtures,
-                                use_container_width=True,
-                                hide_index=True,
-                                height=600
-                            )
-                            
-                            # Fixture Difficulty Trend Line Plot
-                            st.markdown("---")
-                            st.markdown("#### Fixture Difficulty Trend")
-                            
-                            fig = go.Figure()
-                            
-                            # Add line with markers
-                            fig.add_trace(go.Scatter(
-                                x=fixtures_df['GW'],
-                                y=fixtures_df['FDR'],
-                                mode='lines+markers',
-                                name='FDR',
-                                line=dict(color='#3498db', width=3),
-                                marker=dict(
-                                    size=10,
-                                    color=fixtures_df['FDR'].apply(get_fdr_color),
-                                    line=dict(color='white', width=1)
-                                ),
-                                text=fixtures_df['OPP'],
-                                hovertemplate='<b>GW%{x}</b><br>' +
-                                             'vs %{text}<br>' +
-                                             'FDR: %{y:.2f}<br>' +
-                                             '<extra></extra>'
-                            ))
-                            
-                            # Add difficulty zone lines
-                            fig.add_hline(
-                                y=2.5,
-                                line_dash="dash",
-                                line_color="#40E0D0",
-                                line_width=2,
-                                annotation_text="Easy/Medium",
-                                annotation_position="right"
-                            )
-                            
-                            fig.add_hline(
-                                y=3.5,
-                                line_dash="dash",
-                                line_color="#FF69B4",
-                                line_width=2,
-                                annotation_text="Medium/Hard",
-                                annotation_position="right"
-                            )
-                            
-                            fig.update_layout(
-                                xaxis_title="Gameweek",
-                                yaxis_title="Fixture Difficulty Rating",
-                                yaxis=dict(range=[1, 5]),
-                                height=400,
-                                showlegend=False,
-                                hovermode='closest'
-                            )
-                            
-                            st.plotly_chart(fig, use_container_width=True)
-                        else:
-                            st.info("No upcoming fixtures available")
+                        st.markdown("---")
+                        
+                        # Scrollable table showing all fixtures until GW38
+                        st.markdown(_build_fixtures_html(fixtures_df), unsafe_allow_html=True)
+                        
+                        # Fixture Difficulty Trend Line Plot
+                        st.markdown("---")
+                        st.markdown("#### Fixture Difficulty Trend")
+                        
+                        st.plotly_chart(_build_fdr_trend_figure(fixtures_df), use_container_width=True)
                     else:
                         st.info("No upcoming fixtures available")
                 else:
@@ -1170,25 +1082,44 @@ def show_player_overview(player_info, recent_matches):
     else:
         st.info("Fixture analyzer not available")
 
-def show_match_table(recent_matches):
-    """Show match-by-match table with Totals and Per 90 rows"""
-    
-    # Check if we have any match data
-    if recent_matches.empty:
-        return
-    
-    st.markdown("---")
-    st.markdown("#### 🎯 Match-by-Match Performance")
+# Minutes, performance metrics, goals conceded/xGC (mainly relevant for DEF/GK), DC and BPS/Bonus
+# as (label, source column, decimals) - counts are shown as whole numbers
+_MATCH_STAT_COLUMNS = [
+    ('MP', 'minutes', 0),
+    ('Pts', 'total_points', 0),
+    ('G', 'goals_scored', 0),
+    ('A', 'assists', 0),
+    ('xG', 'expected_goals', 2),
+    ('xA', 'expected_assists', 2),
+    ('xGI', 'expected_goal_involvements', 2),
+    ('GC', 'goals_conceded', 0),
+    ('xGC', 'expected_goals_conceded', 2),
+    ('DC', 'defensive_contribution', 0),
+    ('BPS', 'bps', 0),
+    ('Bonus', 'bonus', 0),
+]
+
+# Stat columns stay numeric and are formatted client-side by st.dataframe
+_MATCH_COLUMN_CONFIG = {
+    label: st.column_config.NumberColumn(label, format='%.2f' if decimals else '%d')
+    for label, _, decimals in _MATCH_STAT_COLUMNS
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_match_table_df(recent_matches):
+    """Formatted match-by-match rows, and the Totals and Per 90 rows as a separate frame"""
     
-    # Sort by gameweek descending (most recent first)
-    display_df = recent_matches.copy()
-    display_df = display_df.sort_values('round', ascending=False)
+    # Sort by gameweek descending (most recent first) - the loader already
+    # stores each player's matches in this order
+    display_df = recent_matches
+    if not display_df['round'].is_monotonic_decreasing:
+        display_df = display_df.sort_values('round', ascending=False)
     
     # Select and format columns for display
     final_df = pd.DataFrame()
     
     # GW and Opponent
-    final_df['GW'] = display_df['round'].apply(lambda x: f"{int(x)}" if pd.notna(x) else "")
+    final_df['GW'] = display_df['round'].astype(int).astype(str)
     
     # Opponent with (H)/(A)
     opponent_col = None
@@ -1198,112 +1129,160 @@ def show_match_table(recent_matches):
             break
     
     if opponent_col:
-        final_df['OPP'] = display_df.apply(
-            lambda row: format_opponent_display(row[opponent_col], row.get('was_home', True)),
-            axis=1
-        )
+        final_df['OPP'] = format_opponent_column(display_df, opponent_col)
     else:
         final_df['OPP'] = 'N/A'
     
-    # Started (ST) and Minutes (MP)
-    final_df['ST'] = display_df['starts'].apply(lambda x: '✓' if x == 1 or x == True else '-')
-    final_df['MP'] = display_df['minutes'].apply(lambda x: f"{int(x)}" if pd.notna(x) else "0")
-    
-    # Performance metrics
-    final_df['Pts'] = display_df['total_points'].apply(
-        lambda x: f"{x:.1f}" if isinstance(x, float) else int(x) if pd.notna(x) else 0
-    )
-    final_df['G'] = display_df['goals_scored'].apply(lambda x: f"{int(x)}" if pd.notna(x) else "0")
-    final_df['A'] = display_df['assists'].apply(lambda x: f"{int(x)}" if pd.notna(x) else "0")
-    final_df['xG'] = display_df['expected_goals'].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "0.00")
-    final_df['xA'] = display_df['expected_assists'].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "0.00")
-    final_df['xGI'] = display_df['expected_goal_involvements'].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "0.00")
-    
-    # Goals Conceded and xGC (for all positions, but mainly relevant for DEF/GK)
-    final_df['GC'] = display_df['goals_conceded'].apply(
-        lambda x: f"{x:.1f}" if isinstance(x, float) else int(x) if pd.notna(x) else 0
-    )
-    final_df['xGC'] = display_df['expected_goals_conceded'].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "0.00")
-    final_df['DC'] = display_df['defensive_contribution'].apply(
-        lambda x: f"{x:.1f}" if isinstance(x, float) else int(x) if pd.notna(x) else 0
-    )
-    
-    # BPS/Bonus
-    final_df['BPS'] = display_df['bps'].apply(
-        lambda x: f"{x:.1f}" if isinstance(x, float) else int(x) if pd.notna(x) else 0
-    )
-    final_df['Bonus'] = display_df['bonus'].apply(
-        lambda x: f"{x:.1f}" if isinstance(x, float) else int(x) if pd.notna(x) else 0
-    )
-    
-    # Calculate totals
-    totals_row = {
-        'GW': 'Totals',
-        'OPP': '',
-        'ST': f"{display_df['starts'].sum():.0f}",
-        'MP': f"{display_df['minutes'].sum():.0f}",
-        'Pts': f"{display_df['total_points'].sum():.1f}",
-        'G': f"{display_df['goals_scored'].sum():.0f}",
-        'A': f"{display_df['assists'].sum():.0f}",
-        'xG': f"{display_df['expected_goals'].sum():.2f}",
-        'xA': f"{display_df['expected_assists'].sum():.2f}",
-        'xGI': f"{display_df['expected_goal_involvements'].sum():.2f}",
-        'GC': f"{display_df['goals_conceded'].sum():.1f}",
-        'xGC': f"{display_df['expected_goals_conceded'].sum():.2f}",
-        'DC': f"{display_df['defensive_contribution'].sum():.1f}",
-        'BPS': f"{display_df['bps'].sum():.1f}",
-        'Bonus': f"{display_df['bonus'].sum():.1f}"
-    }
+    # Started (ST)
+    final_df['ST'] = np.where(display_df['starts'].to_numpy() == 1, '✓', '-')
+    
+    # Stat columns, counts as whole numbers - see _MATCH_COLUMN_CONFIG for display formats
+    for label, col, decimals in _MATCH_STAT_COLUMNS:
+        values = display_df[col].fillna(0)
+        final_df[label] = values if decimals else values.round().astype(int)
+    
+    # Column sums computed once and shared by the Totals and Per 90 rows
+    # as (label, source column, totals format)
+    agg_columns = [
+        ('ST', 'starts', '%.0f'),
+        ('MP', 'minutes', '%.0f'),
+        ('Pts', 'total_points', '%.1f'),
+        ('G', 'goals_scored', '%.0f'),
+        ('A', 'assists', '%.0f'),
+        ('xG', 'expected_goals', '%.2f'),
+        ('xA', 'expected_assists', '%.2f'),
+        ('xGI', 'expected_goal_involvements', '%.2f'),
+        ('GC', 'goals_conceded', '%.1f'),
+        ('xGC', 'expected_goals_conceded', '%.2f'),
+        ('DC', 'defensive_contribution', '%.1f'),
+        ('BPS', 'bps', '%.1f'),
+        ('Bonus', 'bonus', '%.1f'),
+    ]
+    agg_labels, agg_cols, agg_formats = zip(*agg_columns)
+    sums = display_df[list(agg_cols)].to_numpy(dtype=np.float64).sum(axis=0)
+    
+    # Calculate totals - every cell formatted in one vectorized pass
+    totals_row = {'GW': 'Totals', 'OPP': ''}
+    totals_row.update(zip(agg_labels, np.char.mod(np.array(agg_formats), sums).tolist()))
     
     # Calculate per 90
-    total_minutes = display_df['minutes'].sum()
+    total_minutes = sums[1]
     if total_minutes > 0:
+        per90 = sums * (90 / total_minutes)
         per90_row = {
             'GW': 'Per 90',
             'OPP': '',
             'ST': '',
-            'MP': f"{total_minutes / display_df['starts'].sum():.0f}",  # Avg mins per start
-            'Pts': f"{(display_df['total_points'].sum() * 90 / total_minutes):.2f}",
-            'G': f"{(display_df['goals_scored'].sum() * 90 / total_minutes):.2f}",
-            'A': f"{(display_df['assists'].sum() * 90 / total_minutes):.2f}",
-            'xG': f"{(display_df['expected_goals'].sum() * 90 / total_minutes):.2f}",
-            'xA': f"{(display_df['expected_assists'].sum() * 90 / total_minutes):.2f}",
-            'xGI': f"{(display_df['expected_goal_involvements'].sum() * 90 / total_minutes):.2f}",
-            'GC': f"{(display_df['goals_conceded'].sum() * 90 / total_minutes):.2f}",
-            'xGC': f"{(display_df['expected_goals_conceded'].sum() * 90 / total_minutes):.2f}",
-            'DC': f"{(display_df['defensive_contribution'].sum() * 90 / total_minutes):.2f}",
-            'BPS': f"{(display_df['bps'].sum() * 90 / total_minutes):.2f}",
-            'Bonus': f"{(display_df['bonus'].sum() * 90 / total_minutes):.2f}"
+            'MP': f"{total_minutes / sums[0]:.0f}",  # Avg mins per start
         }
+        per90_row.update(zip(agg_labels[2:], np.char.mod('%.2f', per90[2:]).tolist()))
     else:
         per90_row = {col: '0.00' for col in final_df.columns}
         per90_row['GW'] = 'Per 90'
     
-    # Append totals and per 90 rows
-    final_df = pd.concat([
-        final_df,
-        pd.DataFrame([totals_row]),
-        pd.DataFrame([per90_row])
-    ], ignore_index=True)
-    
-    # Apply styling
-    def highlight_totals_per90(row):
-        if row['GW'] == 'Totals':
-            return ['background-color: #2c3e50; color: white; font-weight: bold'] * len(row)
-        elif row['GW'] == 'Per 90':
-            return ['background-color: #34495e; color: white; font-weight: bold'] * len(row)
-        else:
-            return [''] * len(row)
+    summary_df = pd.DataFrame([totals_row, per90_row], columns=final_df.columns)
+    
+    return final_df, summary_df
+
+def show_match_table(recent_matches):
+    """Show match-by-match table with Totals and Per 90 rows"""
     
-    styled_df = final_df.style.apply(highlight_totals_per90, axis=1)
+    # Check if we have any match data
+    if recent_matches.empty:
+        return
+    
+    st.markdown("---")
+    st.markdown("#### 🎯 Match-by-Match Performance")
     
-    # Display the table
+    final_df, summary_df = _build_match_table_df(recent_matches)
+    
+    # Display the matches
     st.dataframe(
-        styled_df,
+        final_df,
         use_container_width=True,
         hide_index=True,
-        height=min(600, len(final_df) * 35 + 38)
+        height=min(600, len(final_df) * 35 + 38),
+        column_config=_MATCH_COLUMN_CONFIG
     )
+    
+    # Totals and Per 90 rendered below as their own small table
+    summary_styles = pd.DataFrame('', index=summary_df.index, columns=summary_df.columns)
+    summary_styles.iloc[0] = 'background-color: #2c3e50; color: white; font-weight: bold'
+    summary_styles.iloc[1] = 'background-color: #34495e; color: white; font-weight: bold'
+    
+    st.dataframe(
+        summary_df.style.apply(lambda _: summary_styles, axis=None),
+        use_container_width=True,
+        hide_index=True
+    )
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _sidebar_choices(_player_data, data_version):
+    """Sorted position and team options plus the price bounds for the sidebar filters"""
+    # Categories are already sorted and exclude missing values
+    unique_positions = _player_data['position'].cat.categories.tolist()
+    unique_teams = _player_data['team'].cat.categories.tolist()
+    
+    price_bounds = None
+    if 'price' in _player_data.columns:
+        price_bounds = (float(_player_data['price'].min()), float(_player_data['price'].max()))
+    
+    return unique_positions, unique_teams, price_bounds
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _filter_player_names(_player_data, data_version, position, team, price_range):
+    """Names of the players passing the sidebar filters, highest total points first"""
+    # Combine the filters into one mask and slice once
+    mask = np.ones(len(_player_data), dtype=bool)
+    
+    if position != "All":
+        mask &= _cat_mask(_player_data['position'], position)
+    
+    if team != "All":
+        mask &= _cat_mask(_player_data['team'], team)
+    
+    if price_range:
+        prices = _player_data['price'].to_numpy()
+        mask &= (prices >= price_range[0]) & (prices <= price_range[1])
+    
+    filtered_data = _player_data.loc[mask].sort_values('total_points', ascending=False)
+    
+    return filtered_data['full_name'].tolist()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _name_index(_player_data, data_version):
+    """Positional row of each player, so the selected player is read without a boolean scan"""
+    # Built back to front so a repeated name maps to its first row, as a mask + iloc[0] would
+    return {name: i for i, name in reversed(list(enumerate(_player_data['full_name'])))}
+
+def _matches_by_name(match_data):
+    """
+    Match data indexed and sorted by full_name, with the numeric columns
+    coerced and downcast - built once per loaded frame and kept in the session
+    """
+    cached = st.session_state.get('_matches_by_name')
+    if cached is None or cached[0] is not match_data:
+        by_name = match_data.set_index('full_name').sort_index(kind='stable')
+        
+        # Ensure numeric columns are properly typed
+        numeric_cols = list(PRESENT_NUMERIC_COLS)
+        by_name[numeric_cols] = by_name[numeric_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+        by_name = by_name.astype(
+            {**dict.fromkeys(INT16_COLS, 'int16'), **dict.fromkeys(FLOAT32_COLS, 'float32')}
+        )
+        
+        cached = (match_data, by_name)
+        st.session_state['_matches_by_name'] = cached
+    return cached[1]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _player_matches(_match_data, data_version, name):
+    """One player's typed match rows, newest first - reselecting a player is a cache hit"""
+    # The index is sorted, so the player's rows are one positional slice (empty if absent)
+    # and reset_index is the only copy made
+    matches_by_name = _matches_by_name(_match_data)
+    start, stop = matches_by_name.index.slice_locs(name, name)
+    return matches_by_name.iloc[start:stop].reset_index()
 
 def show(player_data, match_data):
     """Main function to display player detail page"""
@@ -1311,7 +1290,12 @@ def show(player_data, match_data):
     # Player selection
     st.title("👤 Player Detail")
     
+    # Identifies the loaded data for the caches below, which skip hashing the frames
+    data_version = st.session_state.get('data_version', 0)
+    
     # Sidebar filters
+    unique_positions, unique_teams, price_bounds = _sidebar_choices(player_data, data_version)
+    
     with st.sidebar:
         st.markdown("### 🔧 Player Filters")
         
@@ -1319,7 +1303,6 @@ def show(player_data, match_data):
         
         with col1:
             # Position filter
-            unique_positions = sorted(player_data['position'].dropna().unique().tolist())
             selected_position = st.selectbox(
                 "Position",
                 ["All"] + unique_positions,
@@ -1328,7 +1311,6 @@ def show(player_data, match_data):
         
         with col2:
             # Team filter
-            unique_teams = sorted(player_data['team'].dropna().unique().tolist())
             selected_team = st.selectbox(
                 "Team",
                 ["All"] + unique_teams,
@@ -1336,9 +1318,8 @@ def show(player_data, match_data):
             )
         
         # Price range filter
-        if 'price' in player_data.columns:
-            min_price = float(player_data['price'].min())
-            max_price = float(player_data['price'].max())
+        if price_bounds:
+            min_price, max_price = price_bounds
             
             price_range = st.slider(
                 "Price Range (£m)",
@@ -1351,26 +1332,8 @@ def show(player_data, match_data):
         else:
             price_range = None
     
-    # Apply filters
-    filtered_data = player_data.copy()
-    
-    if selected_position != "All":
-        filtered_data = filtered_data[filtered_data['position'] == selected_position]
-    
-    if selected_team != "All":
-        filtered_data = filtered_data[filtered_data['team'] == selected_team]
-    
-    if price_range:
-        filtered_data = filtered_data[
-            (filtered_data['price'] >= price_range[0]) &
-            (filtered_data['price'] <= price_range[1])
-        ]
-    
-    # Sort by total points
-    filtered_data = filtered_data.sort_values('total_points', ascending=False)
-    
-    # Player selection
-    player_names = filtered_data['full_name'].tolist()
+    # Apply filters and sort by total points
+    player_names = _filter_player_names(player_data, data_version, selected_position, selected_team, price_range)
     
     # Default to Haaland if available, otherwise first player
     default_index = 0
@@ -1384,8 +1347,9 @@ def show(player_data, match_data):
         key="player_detail_select"
     )
     
-    # Get player data
-    player_info = filtered_data[filtered_data['full_name'] == selected_player_name].iloc[0].to_dict()
+    # Get player data as a row Series, read by label where needed
+    row_idx = _name_index(player_data, data_version)[selected_player_name]
+    player_info = player_data.iloc[row_idx]
     
     # Check if match data is available
     if match_data is None or match_data.empty:
@@ -1396,7 +1360,7 @@ def show(player_data, match_data):
         return
     
     # Get player's match history using full_name (most reliable matching)
-    player_matches = match_data[match_data['full_name'] == selected_player_name].copy()
+    player_matches = _player_matches(match_data, data_version, selected_player_name)
     
     if player_matches.empty:
         st.warning(f"⚠️ No match data available for {selected_player_name}")
@@ -1405,18 +1369,6 @@ def show(player_data, match_data):
         show_player_overview(player_info, pd.DataFrame())
         return
     
-    # Ensure numeric columns are properly typed
-    numeric_cols = ['round', 'total_points', 'goals_scored', 'assists', 
-                    'expected_goals', 'expected_assists', 'expected_goal_involvements',
-                    'clean_sheets', 'goals_conceded', 'expected_goals_conceded',
-                    'minutes', 'defensive_contribution', 'tackles',
-                    'clearances_blocks_interceptions', 'recoveries',
-                    'bps', 'bonus', 'influence', 'creativity', 'threat']
-    
-    for col in numeric_cols:
-        if col in player_matches.columns:
-            player_matches[col] = pd.to_numeric(player_matches[col], errors='coerce').fillna(0)
-    
     # Show player overview
     show_player_overview(player_info, player_matches)
     
@@ -7,8 +7,6 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from math import pi
 import sys
 from pathlib import Path
 
@@ -22,23 +20,118 @@ st.set_page_config(
     layout="wide"
 )
 
-# Check if data is loaded
-if 'player_data' not in st.session_state or st.session_state.player_data is None:
+# Check if data is loaded - the single guard for the page, so show() can assume player data
+if ('player_data' not in st.session_state or st.session_state.player_data is None
+        or st.session_state.player_data.empty):
     st.error("❌ No data loaded. Please go to the Home page and download data first.")
     if st.button("🏠 Go to Home"):
         st.switch_page("app.py")
     st.stop()
 
+# Columns compared against names and positions, held as categoricals on this page
+CATEGORY_COLS = ('full_name', 'position', 'team')
+
+def _compact(player_data):
+    """
+    Player data with the name/position/team columns as categoricals, so the
+    filters compare integer codes, and the integer columns downcast to the
+    smallest type that fits - built once per loaded frame and kept in the session
+    """
+    cached = st.session_state.get('_comparison_player_data')
+    if cached is None or cached[0] is not player_data:
+        compact = player_data.copy(deep=False)
+        for col in CATEGORY_COLS:
+            if col in compact.columns:
+                compact[col] = compact[col].astype('category')
+        
+        # Floats stay float64 - ratios such as minutes_per_fixture can round
+        # differently at float32 under the displayed formats
+        for col in compact.select_dtypes(include='int64').columns:
+            compact[col] = pd.to_numeric(compact[col], downcast='integer')
+        
+        cached = (player_data, compact)
+        st.session_state['_comparison_player_data'] = cached
+    return cached[1]
+
+# One color per compared player, shared by the radar and form charts, with
+# the trace line styles built once
+PLAYER_COLORS = ('#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8')
+_FORM_LINES = tuple(dict(color=color, width=3) for color in PLAYER_COLORS)
+
 # Get data from session state
-player_data = st.session_state.player_data
+player_data = _compact(st.session_state.player_data)
 match_data = st.session_state.match_data
 
+def _position_index(player_data):
+    """
+    Row positions of the players of each position - built once per loaded
+    frame and kept in the session, so position filters slice by index
+    instead of scanning the column
+    """
+    cached = st.session_state.get('_comparison_position_index')
+    if cached is None or cached[0] is not player_data:
+        # Compare the categorical codes, not the position strings
+        codes = player_data['position'].cat.codes.to_numpy()
+        index = {position: np.flatnonzero(codes == code)
+                 for code, position in enumerate(player_data['position'].cat.categories)}
+        
+        cached = (player_data, index)
+        st.session_state['_comparison_position_index'] = cached
+    return cached[1]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _filtered_names(_player_data, data_version, position_filter, min_minutes):
+    """Sorted names of the players passing the position and minutes filters"""
+    # Start from the (usually small) set of rows of the position, then apply the
+    # minutes condition to just those - only the name column is ever sliced
+    minutes = _player_data['total_minutes'].to_numpy()
+    if position_filter != "All":
+        rows = _position_index(_player_data)[position_filter]
+        rows = rows[minutes[rows] >= min_minutes]
+    else:
+        rows = np.flatnonzero(minutes >= min_minutes)
+    
+    return sorted(pd.unique(_player_data['full_name'].to_numpy()[rows]))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _name_index(_player_data, data_version):
+    """Positional row of each player, so the selected players are read without a boolean scan"""
+    # Built back to front so a repeated name maps to its first row, as a mask + iloc[0] would
+    return {name: i for i, name in reversed(list(enumerate(_player_data['full_name'])))}
+
+def _top_n_rows(values, n):
+    """
+    Positions of the n largest values, largest first with ties in row order
+    and missing values last, like DataFrame.nlargest
+    """
+    values = np.nan_to_num(values.astype(np.float64), nan=-np.inf)
+    rows = np.arange(len(values))
+    
+    # Partial selection finds the n-th largest value, so only the candidates are sorted
+    if len(rows) > n:
+        kth = np.partition(values, len(rows) - n)[len(rows) - n]
+        rows = np.flatnonzero(values >= kth)
+    
+    order = np.argsort(-values[rows], kind='stable')
+    return rows[order[:n]]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _suggestions(_player_data, data_version):
+    """Top scorers and hot form players suggested before a comparison is picked"""
+    top_rows = _top_n_rows(_player_data['total_points'].to_numpy(), 5)
+    top_scorers = _player_data.iloc[top_rows][['full_name', 'position', 'total_points']]
+    
+    hot_rows = np.flatnonzero((_player_data['hot_form'] == True).to_numpy())
+    hot_rows = hot_rows[_top_n_rows(_player_data['form_trend_points'].to_numpy()[hot_rows], 5)]
+    hot_form = _player_data.iloc[hot_rows][['full_name', 'position', 'points_per90_last_5']]
+    
+    return top_scorers, hot_form
+
 def show(player_data, match_data):
     """Display player comparison page"""
     
-    if player_data is None or player_data.empty:
-        st.error("❌ No player data available. Please download data from the sidebar.")
-        return
+    # Identifies the loaded data for the caches below, which skip hashing the frames
+    data_version = st.session_state.get('data_version', 0)
     
     st.header("👥 Player Comparison")
     st.markdown("Compare players head-to-head with radar charts and detailed statistics")
@@ -50,11 +143,12 @@ def show(player_data, match_data):
     col1, col2, col3 = st.columns([2, 2, 1])
     
     with col1:
-        unique_positions = player_data['position'].dropna().unique().tolist()
+        # Categories are already sorted and exclude missing values
+        unique_positions = player_data['position'].cat.categories.tolist()
         # Filter options
         position_filter = st.selectbox(
             "Filter by Position",
-            ["All"] + sorted(unique_positions),
+            ["All"] + unique_positions,
             key="comp_position"
         )
     with col2:
@@ -68,11 +162,7 @@ def show(player_data, match_data):
         )
     
     # Filter player list
-    filtered_players = player_data[player_data['total_minutes'] >= min_minutes].copy()
-    if position_filter != "All":
-        filtered_players = filtered_players[filtered_players['position'] == position_filter]
-    
-    player_list = sorted(filtered_players['full_name'].unique())
+    player_list = _filtered_names(player_data, data_version, position_filter, min_minutes)
     
     # Multi-select for players (2-5 players)
     selected_players = st.multiselect(
@@ -90,22 +180,21 @@ def show(player_data, match_data):
         
         col1, col2 = st.columns(2)
         
+        top_scorers, hot_form = _suggestions(player_data, data_version)
+        
         with col1:
             st.markdown("**Top Scorers**")
-            top_scorers = player_data.nlargest(5, 'total_points')[['full_name', 'position', 'total_points']]
             st.dataframe(top_scorers, hide_index=True, use_container_width=True)
         
         with col2:
             st.markdown("**Hot Form Players**")
-            hot_form = player_data[player_data['hot_form'] == True].nlargest(5, 'form_trend_points')[
-                ['full_name', 'position', 'points_per90_last_5']
-            ]
             st.dataframe(hot_form, hide_index=True, use_container_width=True)
         
         return
     
-    # Get data for selected players
-    comparison_df = player_data[player_data['full_name'].isin(selected_players)].copy()
+    # Get data for selected players, kept in player data order
+    name_index = _name_index(player_data, data_version)
+    comparison_df = player_data.iloc[np.sort([name_index[name] for name in selected_players])]
     
     # Summary metrics
     st.markdown("---")
@@ -113,7 +202,7 @@ def show(player_data, match_data):
     
     cols = st.columns(len(selected_players))
     for idx, (col, player_name) in enumerate(zip(cols, selected_players)):
-        player = comparison_df[comparison_df['full_name'] == player_name].iloc[0]
+        player = player_data.iloc[name_index[player_name]]
         with col:
             st.markdown(f"**{player['full_name']}**")
             st.markdown(f"*{player['position']}*")
@@ -132,24 +221,35 @@ def show(player_data, match_data):
     ])
     
     with tab1:
-        show_radar_charts(comparison_df, player_data)
+        show_radar_charts(comparison_df, player_data, data_version)
     
     with tab2:
         show_performance_comparison(comparison_df)
     
     with tab3:
-        show_form_comparison(comparison_df, match_data)
+        show_form_comparison(comparison_df, match_data, data_version)
     
     with tab4:
         show_detailed_stats(comparison_df)
 
-def show_radar_charts(df, player_data):
+@st.cache_data(ttl=3600, show_spinner=False)
+def _radar_figure(_all_players_df, data_version, player_names, categories, metrics, use_percentiles):
+    """Radar chart of a set of players as a cacheable figure dict"""
+    # Rows in player data order, whatever the order of the names
+    name_index = _name_index(_all_players_df, data_version)
+    df = _all_players_df.iloc[np.sort([name_index[name] for name in player_names])]
+    fig = create_radar_chart(df, list(categories), list(metrics), PLAYER_COLORS,
+                             use_percentiles=use_percentiles, all_players_df=_all_players_df,
+                             data_version=data_version)
+    return fig.to_dict()
+
+def show_radar_charts(df, player_data, data_version):
     """Show radar chart comparisons"""
     
     st.subheader("Radar Chart Comparisons")
     
-    # Color palette
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']
+    # The figures only depend on which players are selected, not on selection order
+    player_names = tuple(sorted(df['full_name']))
     
     col1, col2 = st.columns(2)
     
@@ -162,7 +262,7 @@ def show_radar_charts(df, player_data):
         metrics = ['points_per90_last_5', 'xGI_per90_last_5', 'minutes_per_fixture',
                   'bonus', 'total_points']
         
-        fig1 = create_radar_chart(df, categories, metrics, colors, use_percentiles=True, all_players_df=player_data)
+        fig1 = _radar_figure(player_data, data_version, player_names, tuple(categories), tuple(metrics), True)
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
@@ -172,7 +272,7 @@ def show_radar_charts(df, player_data):
         categories = ['Goals', 'Assists', 'xG', 'xA', 'xGI']
         metrics = ['goals_scored', 'assists', 'total_xG', 'total_xA', 'total_xGI']
         
-        fig2 = create_radar_chart(df, categories, metrics, colors, use_percentiles=False, all_players_df=player_data)
+        fig2 = _radar_figure(player_data, data_version, player_names, tuple(categories), tuple(metrics), False)
         st.plotly_chart(fig2, use_container_width=True)
     
     # Recent form radar
@@ -182,10 +282,32 @@ def show_radar_charts(df, player_data):
     metrics = ['points_last_5', 'goals_last_5', 'assists_last_5', 
               'xGI_last_5', 'minutes_last_5', 'bonus']
     
-    fig3 = create_radar_chart(df, categories, metrics, colors, use_percentiles=False, all_players_df=player_data)
+    fig3 = _radar_figure(player_data, data_version, player_names, tuple(categories), tuple(metrics), False)
     st.plotly_chart(fig3, use_container_width=True)
 
-def create_radar_chart(df, categories, metrics, colors, use_percentiles=True, all_players_df=None):
+@st.cache_data(ttl=3600, show_spinner=False)
+def _position_sorted(_all_players_df, data_version, position, metrics):
+    """
+    Sorted values of each metric among the players of a position, for percentile
+    lookups, and whether each metric varies at all (std > 0)
+    """
+    position_rows = _position_index(_all_players_df).get(position, np.empty(0, dtype=np.intp))
+    position_data = _all_players_df.iloc[position_rows]
+    
+    # float64 like the looked-up values, so searchsorted never casts the reference
+    sorted_values = {metric: np.sort(position_data[metric].to_numpy(dtype=np.float64)) for metric in metrics}
+    
+    # Sorted with missing values last, so a metric varies exactly when its first
+    # and last non-missing values differ - std() skips missing values the same way
+    varies = {}
+    for metric, values in sorted_values.items():
+        n_valid = np.count_nonzero(~np.isnan(values))
+        varies[metric] = n_valid > 1 and values[0] < values[n_valid - 1]
+    
+    return sorted_values, varies
+
+def create_radar_chart(df, categories, metrics, colors, use_percentiles=True, all_players_df=None,
+                       data_version=0):
     """Create a radar chart for player comparison"""
     
     fig = go.Figure()
@@ -193,33 +315,40 @@ def create_radar_chart(df, categories, metrics, colors, use_percentiles=True, al
     # Get position for percentile calculation
     position = df.iloc[0]['position']
     
-    for idx, (_, player) in enumerate(df.iterrows()):
-        values = []
+    # Metric values of every player as one (players x metrics) matrix
+    values_matrix = df[list(metrics)].to_numpy(dtype=np.float64)
+    
+    if use_percentiles and position and all_players_df is not None:
+        position_sorted, varies = _position_sorted(all_players_df, data_version, position, tuple(metrics))
         
-        for metric in metrics:
-            val = player[metric]
-            
-            if use_percentiles and position and all_players_df is not None:
-                # Calculate percentile within position
-                position_data = all_players_df[all_players_df['position'] == position][metric]
-                
-                if position_data.std() > 0:
-                    percentile = (position_data <= val).sum() / len(position_data) * 100
-                else:
-                    percentile = 50
-                values.append(percentile)
-            else:
-                values.append(val)
+        # Percentile within position - count of values <= val by binary search,
+        # a whole metric column at a time (50 when the metric doesn't vary)
+        percentiles = np.full(values_matrix.shape, 50.0)
+        for j, metric in enumerate(metrics):
+            if varies[metric]:
+                sorted_vals = position_sorted[metric]
+                ranks = np.searchsorted(sorted_vals, values_matrix[:, j], side='right')
+                # A missing value is <= nothing (searchsorted would place it after the end)
+                ranks[np.isnan(values_matrix[:, j])] = 0
+                percentiles[:, j] = ranks / len(sorted_vals) * 100
+        values_matrix = percentiles
+    
+    # Trace attributes shared by every player, built once
+    theta = list(categories) + [categories[0]]
+    lines = [dict(color=color, width=2) for color in colors]
+    
+    for idx, player_name in enumerate(df['full_name'].tolist()):
+        values = values_matrix[idx].tolist()
         
         # Close the polygon
         values += values[:1]
         
         fig.add_trace(go.Scatterpolar(
             r=values,
-            theta=categories + [categories[0]],
+            theta=theta,
             fill='toself',
-            name=player['full_name'],
-            line=dict(color=colors[idx % len(colors)], width=2),
+            name=player_name,
+            line=lines[idx % len(colors)],
             fillcolor=colors[idx % len(colors)],
             opacity=0.3
         ))
@@ -246,75 +375,65 @@ def create_radar_chart(df, categories, metrics, colors, use_percentiles=True, al
     
     return fig
 
-def show_performance_comparison(df):
-    """Show performance comparison charts"""
-    
-    st.subheader("Performance Comparison")
-    
-    # Bar charts for key metrics
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Total points comparison
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=df['full_name'],
-            y=df['total_points'],
-            text=df['total_points'].round(0),
-            textposition='auto',
-            marker_color='#3498db'
-        ))
-        
-        fig.update_layout(
-            title='Total FPL Points',
-            yaxis_title='Points',
-            showlegend=False,
-            height=350
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_performance_figures(df):
+    """Points, points per 90 and goals/assists comparison charts as cacheable figure dicts"""
+    # Only needed when the figures are rebuilt, so imported here rather than at page load
+    from plotly.subplots import make_subplots
+    
+    # Total points comparison
+    points_fig = go.Figure()
+    
+    points_fig.add_trace(go.Bar(
+        x=df['full_name'],
+        y=df['total_points'],
+        text=df['total_points'].round(0),
+        textposition='auto',
+        marker_color='#3498db'
+    ))
+    
+    points_fig.update_layout(
+        title='Total FPL Points',
+        yaxis_title='Points',
+        showlegend=False,
+        height=350
+    )
     
-    with col2:
-        # Points per 90 comparison
-        fig = go.Figure()
-        
-        # Season pts/90
-        fig.add_trace(go.Bar(
-            name='Season',
-            x=df['full_name'],
-            y=df['points_per90_season'],
-            marker_color='lightblue',
-            opacity=0.6
-        ))
-        
-        # Last 5 pts/90
-        fig.add_trace(go.Bar(
-            name='Last 5',
-            x=df['full_name'],
-            y=df['points_per90_last_5'],
-            marker_color='darkblue'
-        ))
-        
-        fig.update_layout(
-            title='Points per 90: Season vs Recent',
-            yaxis_title='Points per 90',
-            barmode='group',
-            height=350
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    # Points per 90 comparison
+    per90_fig = go.Figure()
+    
+    # Season pts/90
+    per90_fig.add_trace(go.Bar(
+        name='Season',
+        x=df['full_name'],
+        y=df['points_per90_season'],
+        marker_color='lightblue',
+        opacity=0.6
+    ))
+    
+    # Last 5 pts/90
+    per90_fig.add_trace(go.Bar(
+        name='Last 5',
+        x=df['full_name'],
+        y=df['points_per90_last_5'],
+        marker_color='darkblue'
+    ))
+    
+    per90_fig.update_layout(
+        title='Points per 90: Season vs Recent',
+        yaxis_title='Points per 90',
+        barmode='group',
+        height=350
+    )
     
     # Goals and Assists
-    st.markdown("#### Goals & Assists Comparison")
-    
-    fig = make_subplots(
+    ga_fig = make_subplots(
         rows=1, cols=2,
         subplot_titles=('Goals', 'Assists')
     )
     
     # Goals
-    fig.add_trace(
+    ga_fig.add_trace(
         go.Bar(
             x=df['full_name'],
             y=df['goals_scored'],
@@ -324,7 +443,7 @@ def show_performance_comparison(df):
         row=1, col=1
     )
     
-    fig.add_trace(
+    ga_fig.add_trace(
         go.Bar(
             x=df['full_name'],
             y=df['total_xG'],
@@ -336,7 +455,7 @@ def show_performance_comparison(df):
     )
     
     # Assists
-    fig.add_trace(
+    ga_fig.add_trace(
         go.Bar(
             x=df['full_name'],
             y=df['assists'],
@@ -347,7 +466,7 @@ def show_performance_comparison(df):
         row=1, col=2
     )
     
-    fig.add_trace(
+    ga_fig.add_trace(
         go.Bar(
             x=df['full_name'],
             y=df['total_xA'],
@@ -359,10 +478,49 @@ def show_performance_comparison(df):
         row=1, col=2
     )
     
-    fig.update_layout(height=400, showlegend=True, barmode='group')
-    st.plotly_chart(fig, use_container_width=True)
+    ga_fig.update_layout(height=400, showlegend=True, barmode='group')
+    
+    return points_fig.to_dict(), per90_fig.to_dict(), ga_fig.to_dict()
 
-def show_form_comparison(df, match_data):
+def show_performance_comparison(df):
+    """Show performance comparison charts"""
+    
+    st.subheader("Performance Comparison")
+    
+    # Only the charted columns are hashed for the figure cache
+    points_fig, per90_fig, ga_fig = _build_performance_figures(
+        df[['full_name', 'total_points', 'points_per90_season', 'points_per90_last_5',
+            'goals_scored', 'total_xG', 'assists', 'total_xA']]
+    )
+    
+    # Bar charts for key metrics
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(points_fig, use_container_width=True)
+    
+    with col2:
+        st.plotly_chart(per90_fig, use_container_width=True)
+    
+    # Goals and Assists
+    st.markdown("#### Goals & Assists Comparison")
+    st.plotly_chart(ga_fig, use_container_width=True)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _last_n_by_player(_match_data, data_version, n):
+    """(rounds, points) arrays of every player's last n matches in gameweek order, from one groupby"""
+    last_n = (
+        _match_data[['full_name', 'round', 'total_points']]
+        .sort_values('round', kind='stable')
+        .groupby('full_name', sort=False)
+        .tail(n)
+    )
+    return {
+        name: (matches['round'].to_numpy(), matches['total_points'].to_numpy())
+        for name, matches in last_n.groupby('full_name', sort=False)
+    }
+
+def show_form_comparison(df, match_data, data_version):
     """Show form trends over time"""
     
     st.subheader("Form Trends")
@@ -374,19 +532,19 @@ def show_form_comparison(df, match_data):
     # Get last 10 games for each player
     fig = go.Figure()
     
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']
+    last_10_by_player = _last_n_by_player(match_data, data_version, 10)
     
-    for idx, (_, player) in enumerate(df.iterrows()):
-        player_name = player['full_name']
-        player_matches = match_data[match_data['full_name'] == player_name].sort_values('round').tail(10)
+    for idx, player_name in enumerate(df['full_name'].tolist()):
+        player_matches = last_10_by_player.get(player_name)
         
-        if not player_matches.empty:
+        if player_matches is not None:
+            rounds, points = player_matches
             fig.add_trace(go.Scatter(
-                x=player_matches['round'],
-                y=player_matches['total_points'],
+                x=rounds,
+                y=points,
                 mode='lines+markers',
                 name=player_name,
-                line=dict(color=colors[idx % len(colors)], width=3),
+                line=_FORM_LINES[idx % len(_FORM_LINES)],
                 marker=dict(size=8)
             ))
     
@@ -403,20 +561,33 @@ def show_form_comparison(df, match_data):
     # Form metrics comparison
     st.markdown("#### Form Metrics (Last 5 Games)")
     
-    form_df = df[['full_name', 'points_last_5', 'goals_last_5', 'assists_last_5',
-                  'xGI_last_5', 'minutes_last_5', 'points_per90_last_5']].copy()
+    # (label, column, format) of the form table
+    form_columns = [
+        ('Points', 'points_last_5', '%.0f'),
+        ('Goals', 'goals_last_5', '%.0f'),
+        ('Assists', 'assists_last_5', '%.0f'),
+        ('xGI', 'xGI_last_5', '%.2f'),
+        ('Minutes', 'minutes_last_5', '%.0f'),
+        ('Pts/90', 'points_per90_last_5', '%.2f'),
+    ]
+    form_labels, form_cols, form_formats = zip(*form_columns)
     
-    form_df.columns = ['Player', 'Points', 'Goals', 'Assists', 'xGI', 'Minutes', 'Pts/90']
+    # Values stay numeric and are formatted client-side through column_config
+    form_df = df[['full_name', *form_cols]].set_axis(['Player', *form_labels], axis=1)
+    
+    column_config = {
+        label: st.column_config.NumberColumn(label, format=fmt)
+        for label, fmt in zip(form_labels, form_formats)
+    }
+    # Points and Pts/90 are highlighted as bars scaled to the best compared player
+    for label, fmt in (('Points', '%.0f'), ('Pts/90', '%.2f')):
+        column_config[label] = st.column_config.ProgressColumn(
+            label, format=fmt, min_value=0, max_value=max(float(form_df[label].max()), 1.0)
+        )
     
     st.dataframe(
-        form_df.style.format({
-            'Points': '{:.0f}',
-            'Goals': '{:.0f}',
-            'Assists': '{:.0f}',
-            'xGI': '{:.2f}',
-            'Minutes': '{:.0f}',
-            'Pts/90': '{:.2f}'
-        }).background_gradient(subset=['Points', 'Pts/90'], cmap='YlGn'),
+        form_df,
+        column_config=column_config,
         use_container_width=True,
         hide_index=True
     )
@@ -426,54 +597,39 @@ def show_detailed_stats(df):
     
     st.subheader("Detailed Statistics Table")
     
-    # Prepare comparison table
-    stats = {
-        'Metric': [],
-    }
-    
-    for player_name in df['full_name']:
-        stats[player_name] = []
-    
-    # Add metrics
+    # Comparison table rows as (label, column, format) - spacer rows have no column
     metrics = [
-        ('Total Points', 'total_points', '{:.0f}'),
-        ('Fixtures Played', 'fixtures_played', '{:.0f}'),
-        ('Total Minutes', 'total_minutes', '{:.0f}'),
-        ('Minutes/Game', 'minutes_per_fixture', '{:.1f}'),
+        ('Total Points', 'total_points', '%.0f'),
+        ('Fixtures Played', 'fixtures_played', '%.0f'),
+        ('Total Minutes', 'total_minutes', '%.0f'),
+        ('Minutes/Game', 'minutes_per_fixture', '%.1f'),
         ('', None, None),  # Spacer
-        ('Points/90 (Season)', 'points_per90_season', '{:.2f}'),
-        ('Points/90 (Last 5)', 'points_per90_last_5', '{:.2f}'),
-        ('Form Trend', 'form_trend_points', '{:+.2f}'),
+        ('Points/90 (Season)', 'points_per90_season', '%.2f'),
+        ('Points/90 (Last 5)', 'points_per90_last_5', '%.2f'),
+        ('Form Trend', 'form_trend_points', '%+.2f'),
         ('', None, None),  # Spacer
-        ('Goals', 'goals_scored', '{:.0f}'),
-        ('Assists', 'assists', '{:.0f}'),
-        ('xG', 'total_xG', '{:.2f}'),
-        ('xA', 'total_xA', '{:.2f}'),
-        ('xG Overperformance', 'xG_overperformance', '{:+.2f}'),
+        ('Goals', 'goals_scored', '%.0f'),
+        ('Assists', 'assists', '%.0f'),
+        ('xG', 'total_xG', '%.2f'),
+        ('xA', 'total_xA', '%.2f'),
+        ('xG Overperformance', 'xG_overperformance', '%+.2f'),
         ('', None, None),  # Spacer
-        ('Goals (Last 5)', 'goals_last_5', '{:.0f}'),
-        ('Assists (Last 5)', 'assists_last_5', '{:.0f}'),
-        ('xGI (Last 5)', 'xGI_last_5', '{:.2f}'),
-        ('Minutes (Last 5)', 'minutes_last_5', '{:.0f}'),
+        ('Goals (Last 5)', 'goals_last_5', '%.0f'),
+        ('Assists (Last 5)', 'assists_last_5', '%.0f'),
+        ('xGI (Last 5)', 'xGI_last_5', '%.2f'),
+        ('Minutes (Last 5)', 'minutes_last_5', '%.0f'),
     ]
     
-    for metric_name, metric_col, fmt in metrics:
-        stats['Metric'].append(metric_name)
-        
-        if metric_col is None:
-            for player_name in df['full_name']:
-                stats[player_name].append('')
-        else:
-            for _, player in df.iterrows():
-                player_name = player['full_name']
-                value = player[metric_col]
-                
-                if fmt:
-                    stats[player_name].append(fmt.format(value))
-                else:
-                    stats[player_name].append(str(value))
-    
-    stats_df = pd.DataFrame(stats)
+    # Every metric row formatted in one vectorized pass over the players
+    player_names = df['full_name'].tolist()
+    metric_values = iter(df[[col for _, col, _ in metrics if col]].to_numpy(dtype=np.float64).T)
+    rows = [
+        np.char.mod(fmt, next(metric_values)) if metric_col else np.full(len(player_names), '')
+        for _, metric_col, fmt in metrics
+    ]
+    
+    stats_df = pd.DataFrame(np.vstack(rows), columns=player_names)
+    stats_df.insert(0, 'Metric', [metric_name for metric_name, _, _ in metrics])
     
     # Display as table
     st.dataframe(
@@ -12,6 +12,7 @@ Features:
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -47,6 +48,57 @@ defensive_df = st.session_state.team_defensive
 attacking_df = st.session_state.team_attacking
 match_data = st.session_state.get('match_data')  # May or may not exist
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _merge_team(defensive_df, attacking_df):
+    """Defensive and attacking team stats joined into one frame, merged once per data refresh"""
+    return defensive_df.merge(
+        attacking_df,
+        on=['team', 'short_name', 'games_played'],
+        how='outer',
+        suffixes=('_def', '_att')
+    )
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _overview_quadrants(df):
+    """
+    League averages and the four attack/defense quadrant tables of the overview:
+    (avg_attack, avg_defense, strong, vulnerable, attack_focused, defense_focused)
+    """
+    avg_attack = df['goals_per_game'].mean()
+    avg_defense = df['goals_conceded_per_game'].mean()
+    
+    # Each side is above (+1), below (-1) or exactly at / missing (0) the league average
+    goals = df['goals_per_game'].to_numpy()
+    conceded = df['goals_conceded_per_game'].to_numpy()
+    attack = (goals > avg_attack).astype(np.int8) - (goals < avg_attack)
+    defense = (conceded < avg_defense).astype(np.int8) - (conceded > avg_defense)
+    
+    # One quadrant code per team (2 * good attack + good defense), grouped in a single pass;
+    # teams on an average line belong to no quadrant
+    in_quadrant = (attack != 0) & (defense != 0)
+    quadrant = (attack > 0) * 2 + (defense > 0)
+    groups = dict(tuple(df[in_quadrant].groupby(quadrant[in_quadrant])))
+    empty = df.iloc[0:0]
+    
+    # Strong teams (good attack, good defense)
+    strong = groups.get(3, empty).sort_values('goals_per_game', ascending=False)
+    
+    # Vulnerable teams (weak attack, weak defense)
+    vulnerable = groups.get(0, empty).sort_values('goals_conceded_per_game', ascending=False)
+    
+    # Attack-focused
+    attack_focused = groups.get(2, empty).sort_values('goals_per_game', ascending=False)
+    
+    # Defense-focused
+    defense_focused = groups.get(1, empty).sort_values('goals_conceded_per_game')
+    
+    return avg_attack, avg_defense, strong, vulnerable, attack_focused, defense_focused
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _teams_by_name(df):
+    """Team rows indexed by team name, for direct lookups in the comparison tab"""
+    return df.set_index('team', drop=False)
+
 def show(defensive_df, attacking_df, match_data=None):
     """Main function to show team analysis"""
     
@@ -72,18 +124,13 @@ def show(defensive_df, attacking_df, match_data=None):
             team_xg_stats = None
     
     # Merge defensive and attacking data
-    team_df = defensive_df.merge(
-        attacking_df,
-        on=['team', 'short_name', 'games_played'],
-        how='outer',
-        suffixes=('_def', '_att')
-    )
+    team_df = _merge_team(defensive_df, attacking_df)
     
-    # Key metrics
+    # Key metrics - best rows found by position with single NaN-skipping reductions
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        best_attack = team_df.nlargest(1, 'goals_per_game').iloc[0]
+        best_attack = team_df.iloc[np.nanargmax(team_df['goals_per_game'].to_numpy())]
         st.metric(
             "⚡ Best Attack",
             best_attack['short_name'],
@@ -91,7 +138,7 @@ def show(defensive_df, attacking_df, match_data=None):
         )
     
     with col2:
-        best_defense = team_df.nsmallest(1, 'goals_conceded_per_game').iloc[0]
+        best_defense = team_df.iloc[np.nanargmin(team_df['goals_conceded_per_game'].to_numpy())]
         st.metric(
             "🛡️ Best Defense",
             best_defense['short_name'],
@@ -99,7 +146,7 @@ def show(defensive_df, attacking_df, match_data=None):
         )
     
     with col3:
-        most_cs = team_df.nlargest(1, 'clean_sheets').iloc[0]
+        most_cs = team_df.iloc[np.nanargmax(team_df['clean_sheets'].to_numpy())]
         st.metric(
             "🚫 Most Clean Sheets",
             most_cs['short_name'],
@@ -531,24 +578,24 @@ def show_overview(df):
     )
     
     # Add quadrant lines
-    avg_attack = df['goals_per_game'].mean()
-    avg_defense = df['goals_conceded_per_game'].mean()
+    avg_attack, avg_defense, strong, vulnerable, attack_focused, defense_focused = _overview_quadrants(df)
     
     fig.add_hline(y=avg_attack, line_dash="dash", line_color="gray", 
                   annotation_text="Avg Attack", annotation_position="right")
     fig.add_vline(x=avg_defense, line_dash="dash", line_color="gray",
                   annotation_text="Avg Defense", annotation_position="top")
     
-    # Add team labels
-    for _, row in df.iterrows():
-        fig.add_annotation(
-            x=row['goals_conceded_per_game'],
-            y=row['goals_per_game'],
-            text=row['short_name'],
-            showarrow=False,
-            yshift=15,
-            font=dict(size=9)
-        )
+    # Add team labels - one text trace above the markers rather than an annotation per team
+    fig.add_trace(go.Scatter(
+        x=df['goals_conceded_per_game'].to_numpy(),
+        y=df['goals_per_game'].to_numpy(),
+        mode='text',
+        text=df['short_name'].to_numpy(),
+        textposition='top center',
+        textfont=dict(size=9),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
     fig.update_layout(height=600)
     st.plotly_chart(fig, use_container_width=True)
@@ -560,11 +607,6 @@ def show_overview(df):
     
     with col1:
         # Strong teams (good attack, good defense)
-        strong = df[
-            (df['goals_per_game'] > avg_attack) & 
-            (df['goals_conceded_per_game'] < avg_defense)
-        ].sort_values('goals_per_game', ascending=False)
-        
         st.success("**💪 Strong Teams** (Good Attack + Defense)")
         if len(strong) > 0:
             st.dataframe(
@@ -577,11 +619,6 @@ def show_overview(df):
     
     with col2:
         # Vulnerable teams (weak attack, weak defense)
-        vulnerable = df[
-            (df['goals_per_game'] < avg_attack) & 
-            (df['goals_conceded_per_game'] > avg_defense)
-        ].sort_values('goals_conceded_per_game', ascending=False)
-        
         st.error("**⚠️ Vulnerable Teams** (Weak Attack + Defense)")
         if len(vulnerable) > 0:
             st.dataframe(
@@ -596,11 +633,6 @@ def show_overview(df):
     
     with col3:
         # Attack-focused
-        attack_focused = df[
-            (df['goals_per_game'] > avg_attack) & 
-            (df['goals_conceded_per_game'] > avg_defense)
-        ].sort_values('goals_per_game', ascending=False)
-        
         st.warning("**⚡ Attack-Focused** (High Scoring)")
         if len(attack_focused) > 0:
             st.dataframe(
@@ -613,11 +645,6 @@ def show_overview(df):
     
     with col4:
         # Defense-focused
-        defense_focused = df[
-            (df['goals_per_game'] < avg_attack) & 
-            (df['goals_conceded_per_game'] < avg_defense)
-        ].sort_values('goals_conceded_per_game')
-        
         st.info("**🛡️ Defense-Focused** (Low Scoring)")
         if len(defense_focused) > 0:
             st.dataframe(
@@ -629,6 +656,23 @@ def show_overview(df):
             st.info("No teams in this category")
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _gradient_table_html(display_df, formats, gradient_col, cmap, table_id):
+    """
+    Formatted table with a colour gradient on one column, styled once per data
+    refresh and rendered to HTML in a scrollable container
+    """
+    styler = (
+        display_df.style
+        .format(formats, escape='html')
+        .background_gradient(subset=[gradient_col], cmap=cmap)
+        .hide(axis='index')
+        .set_uuid(table_id)  # Fixed ids so the cached HTML is deterministic
+        .set_table_attributes('style="width: 100%;"')
+    )
+    
+    return f'<div style="max-height: 600px; overflow-y: auto;">{styler.to_html()}</div>'
+
 def show_attacking_stats(df):
     """Show attacking statistics"""
     
@@ -640,9 +684,9 @@ def show_attacking_stats(df):
     # Bar chart - Goals per game
     fig = go.Figure()
     
-    # Color bars based on performance
-    colors = ['#27ae60' if x > df['goals_per_game'].mean() else '#e74c3c' 
-              for x in df_sorted['goals_per_game']]
+    # Color bars based on performance - league average computed once for the colors and the line
+    avg = df['goals_per_game'].mean()
+    colors = np.where(df_sorted['goals_per_game'].to_numpy() > avg, '#27ae60', '#e74c3c')
     
     fig.add_trace(go.Bar(
         x=df_sorted['short_name'],
@@ -656,7 +700,6 @@ def show_attacking_stats(df):
     ))
     
     # Add average line
-    avg = df['goals_per_game'].mean()
     fig.add_hline(y=avg, line_dash="dash", line_color="gray",
                   annotation_text=f"Avg: {avg:.2f}", annotation_position="right")
     
@@ -676,15 +719,13 @@ def show_attacking_stats(df):
     display_df = df_sorted[['team', 'short_name', 'games_played', 'goals_scored', 'goals_per_game']].copy()
     display_df.columns = ['Team', 'Short', 'Games', 'Total Goals', 'Goals/Game']
     
-    st.dataframe(
-        display_df.style.format({
-            'Games': '{:.0f}',
-            'Total Goals': '{:.0f}',
-            'Goals/Game': '{:.2f}'
-        }).background_gradient(subset=['Goals/Game'], cmap='RdYlGn'),
-        use_container_width=True,
-        hide_index=True,
-        height=600
+    st.markdown(
+        _gradient_table_html(
+            display_df,
+            {'Games': '{:.0f}', 'Total Goals': '{:.0f}', 'Goals/Game': '{:.2f}'},
+            'Goals/Game', 'RdYlGn', 'attacking'
+        ),
+        unsafe_allow_html=True
     )
     
     # Top 5 and Bottom 5
@@ -724,8 +765,7 @@ def show_defensive_stats(df):
     
     # Color bars based on performance
     avg_conceded = df['goals_conceded_per_game'].mean()
-    colors = ['#27ae60' if x < avg_conceded else '#e74c3c' 
-              for x in df_sorted['goals_conceded_per_game']]
+    colors = np.where(df_sorted['goals_conceded_per_game'].to_numpy() < avg_conceded, '#27ae60', '#e74c3c')
     
     fig.add_trace(go.Bar(
         x=df_sorted['short_name'],
@@ -788,17 +828,14 @@ def show_defensive_stats(df):
                              'goals_conceded_per_game', 'clean_sheets', 'clean_sheet_%']].copy()
     display_df.columns = ['Team', 'Short', 'Games', 'Total Conceded', 'Conceded/Game', 'CS', 'CS %']
     
-    st.dataframe(
-        display_df.style.format({
-            'Games': '{:.0f}',
-            'Total Conceded': '{:.0f}',
-            'Conceded/Game': '{:.2f}',
-            'CS': '{:.0f}',
-            'CS %': '{:.1f}%'
-        }).background_gradient(subset=['Conceded/Game'], cmap='RdYlGn_r'),
-        use_container_width=True,
-        hide_index=True,
-        height=600
+    st.markdown(
+        _gradient_table_html(
+            display_df,
+            {'Games': '{:.0f}', 'Total Conceded': '{:.0f}', 'Conceded/Game': '{:.2f}',
+             'CS': '{:.0f}', 'CS %': '{:.1f}%'},
+            'Conceded/Game', 'RdYlGn_r', 'defensive'
+        ),
+        unsafe_allow_html=True
     )
     
     # Top 5 and Bottom 5
@@ -852,8 +889,9 @@ def show_team_comparison(df):
         st.warning("Please select different teams")
         return
     
-    t1_data = df[df['team'] == team1].iloc[0]
-    t2_data = df[df['team'] == team2].iloc[0]
+    teams_by_name = _teams_by_name(df)
+    t1_data = teams_by_name.loc[team1]
+    t2_data = teams_by_name.loc[team2]
     
     st.markdown("---")
     
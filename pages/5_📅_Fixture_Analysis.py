@@ -8,15 +8,13 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from utils.fixture_analyzer import analyze_fixtures
+from utils.fixture_analyzer import analyze_fixtures, get_fixture_analyzer, merge_team_form
 
 # Page config
 st.set_page_config(
@@ -36,6 +34,18 @@ if 'team_defensive' not in st.session_state or st.session_state.team_defensive i
 defensive_df = st.session_state.team_defensive
 attacking_df = st.session_state.team_attacking
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _get_team_form(defensive_df, attacking_df):
+    """Merged team form table, rebuilt only when the team data changes"""
+    return merge_team_form(defensive_df, attacking_df)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _team_stat_lookup(team_df, column):
+    """Map of team short_name -> column value (first row per team), built once per table"""
+    teams = team_df.drop_duplicates('short_name')
+    values = teams[column] if column in teams.columns else pd.Series(0, index=teams.index)
+    return dict(zip(teams['short_name'], values))
+
 def get_fdr_color(fdr):
     """Get color based on FDR - turquoise for easy, pink for hard"""
     if fdr <= 2.0:
@@ -51,6 +61,15 @@ def get_fdr_color(fdr):
     else:
         return '#FF1493'  # Deep Pink - Very Hard
 
+# Upper FDR bound of each get_fdr_color bucket and the bucket colours, for
+# colouring whole columns in one pass
+_FDR_BINS = np.array([2.0, 2.5, 3.0, 3.5, 4.0])
+_FDR_COLORS = np.array(['#40E0D0', '#7FFFD4', '#E0E0E0', '#FFB6C1', '#FF69B4', '#FF1493'], dtype=object)
+
+def get_fdr_colors(fdr_values):
+    """Vectorized get_fdr_color"""
+    return _FDR_COLORS[np.digitize(np.asarray(fdr_values, dtype=float), _FDR_BINS, right=True)]
+
 def show(defensive_df, attacking_df):
     """Display fixture analysis page"""
     
@@ -96,7 +115,9 @@ def show(defensive_df, attacking_df):
         fixture_data = analyze_fixtures(
             next_n_gameweeks=next_n_gw,
             defensive_df=defensive_df,
-            attacking_df=attacking_df
+            attacking_df=attacking_df,
+            analyzer=get_fixture_analyzer(),
+            team_form_df=_get_team_form(defensive_df, attacking_df)
         )
     
     team_fixtures = fixture_data['team_fixtures']
@@ -195,34 +216,28 @@ def show(defensive_df, attacking_df):
     with tab5:
         show_detailed_breakdown(detailed_fixtures, team_fixtures)
 
-def show_fixture_calendar(df, next_n_gw, current_gw):
-    """Show fixture calendar heatmap with improved colors"""
-    
-    st.subheader("🗓️ Fixture Difficulty Calendar")
-    
+@st.cache_data(show_spinner=False)
+def _build_calendar_figure(teams, difficulty_scores, fixture_lists, next_n_gw, current_gw):
+    """
+    Fixture difficulty heatmap, returned as a cacheable figure dict. Takes
+    per-team tuples rather than the team fixtures frame, whose list columns
+    Streamlit can only hash by pickling
+    """
     # Create heatmap data
-    heatmap_data = []
-    heatmap_text = []
-    teams = []
-    
-    for _, row in df.iterrows():
-        teams.append(row['short_name'])
-        heatmap_data.append(row['difficulty_scores'])
-        
-        # Create text labels showing opponent
-        text_labels = []
-        for fixture in row['fixture_list']:
-            opponent = fixture.split('(')[0].strip()
-            venue = fixture.split('(')[1].replace(')', '').strip()
-            
-            if venue == 'H':
-                # Home fixture - CAPITAL
-                text_labels.append(opponent.upper())
-            else:
-                # Away fixture - lowercase
-                text_labels.append(opponent.lower())
-        
-        heatmap_text.append(text_labels)
+    teams = list(teams)
+    heatmap_data = [list(scores) for scores in difficulty_scores]
+    
+    # Create text labels showing opponent for every fixture at once:
+    # home fixtures in CAPITALS, away fixtures in lowercase
+    fixtures = pd.Series([list(fixture_list) for fixture_list in fixture_lists], dtype=object).explode()
+    fixture_parts = fixtures.str.split('(')
+    opponents = fixture_parts.str[0].str.strip()
+    venues = fixture_parts.str[1].str.replace(')', '').str.strip()
+    text_labels = pd.Series(
+        np.where(venues == 'H', opponents.str.upper(), opponents.str.lower()),
+        index=fixtures.index
+    )
+    heatmap_text = text_labels.groupby(level=0, sort=False).agg(list).tolist()
     
     # Pad shorter lists with None
     max_len = max(len(scores) for scores in heatmap_data)
@@ -269,53 +284,21 @@ def show_fixture_calendar(df, next_n_gw, current_gw):
         height=800
     )
     
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # Fixture details table with additional stats
-    st.markdown("#### 📝 Detailed Fixture Stats")
-    
-    # Create detailed fixture table
-    fixture_table = []
-    for _, row in df.head(10).iterrows():
-        for i, (fixture, difficulty) in enumerate(zip(row['fixture_list'], row['difficulty_scores'])):
-            opponent = fixture.split('(')[0].strip()
-            venue = '🏠' if '(H)' in fixture else '✈️'
-            
-            fixture_table.append({
-                'Team': row['short_name'],
-                'GW': current_gw + i,
-                'Venue': venue,
-                'Opponent': opponent,
-                'FDR': difficulty
-            })
-    
-    fixture_df = pd.DataFrame(fixture_table)
-    
-    if not fixture_df.empty:
-        st.dataframe(
-            fixture_df.style.format({
-                'FDR': '{:.2f}'
-            }).background_gradient(subset=['FDR'], cmap='RdYlGn_r', vmin=1, vmax=5),
-            use_container_width=True,
-            hide_index=True,
-            height=400
-        )
+    return fig.to_dict()
 
-def show_fixture_rankings(df, next_n_gw):
-    """Show fixture difficulty rankings with improved colors"""
-    
-    st.subheader("📊 Team Fixture Difficulty Rankings")
-    
-    # Bar chart of average difficulty with new color scheme
+@st.cache_data(show_spinner=False)
+def _build_rankings_figure(teams, avg_difficulty, next_n_gw):
+    """Average fixture difficulty bar chart, returned as a cacheable figure dict"""
     fig = go.Figure()
     
-    colors = [get_fdr_color(diff) for diff in df['avg_difficulty']]
+    avg_difficulty = np.asarray(avg_difficulty, dtype=float)
+    colors = get_fdr_colors(avg_difficulty)
     
     fig.add_trace(go.Bar(
-        x=df['short_name'],
-        y=df['avg_difficulty'],
+        x=list(teams),
+        y=avg_difficulty,
         marker_color=colors,
-        text=df['avg_difficulty'].round(2),
+        text=avg_difficulty.round(2),
         textposition='auto',
         hovertemplate='<b>%{x}</b><br>' +
                       'Avg Difficulty: %{y:.2f}<br>' +
@@ -339,6 +322,54 @@ def show_fixture_rankings(df, next_n_gw):
     fig.add_hline(y=4.0, line_dash="dash", line_color="#FF69B4", line_width=2,
                   annotation_text="Hard (4-5)", annotation_position="right")
     
+    return fig.to_dict()
+
+def show_fixture_calendar(df, next_n_gw, current_gw):
+    """Show fixture calendar heatmap with improved colors"""
+    
+    st.subheader("🗓️ Fixture Difficulty Calendar")
+    
+    fig = _build_calendar_figure(
+        tuple(df['short_name']),
+        tuple(map(tuple, df['difficulty_scores'])),
+        tuple(map(tuple, df['fixture_list'])),
+        next_n_gw,
+        current_gw
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Fixture details table with additional stats
+    st.markdown("#### 📝 Detailed Fixture Stats")
+    
+    # Create detailed fixture table - one row per fixture of the top 10 teams
+    top_teams = df.head(10)
+    fixtures = top_teams['fixture_list'].explode()
+    
+    fixture_df = pd.DataFrame({
+        'Team': top_teams['short_name'].repeat(top_teams['fixture_list'].str.len()).to_numpy(),
+        'GW': current_gw + fixtures.groupby(level=0, sort=False).cumcount().to_numpy(),
+        'Venue': np.where(fixtures.str.contains('(H)', regex=False), '🏠', '✈️'),
+        'Opponent': fixtures.str.split('(').str[0].str.strip().to_numpy(),
+        'FDR': top_teams['difficulty_scores'].explode().to_numpy(dtype=float)
+    })
+    
+    if not fixture_df.empty:
+        st.dataframe(
+            fixture_df.style.format({
+                'FDR': '{:.2f}'
+            }).background_gradient(subset=['FDR'], cmap='RdYlGn_r', vmin=1, vmax=5),
+            use_container_width=True,
+            hide_index=True,
+            height=400
+        )
+
+def show_fixture_rankings(df, next_n_gw):
+    """Show fixture difficulty rankings with improved colors"""
+    
+    st.subheader("📊 Team Fixture Difficulty Rankings")
+    
+    # Bar chart of average difficulty with new color scheme
+    fig = _build_rankings_figure(tuple(df['short_name']), tuple(df['avg_difficulty']), next_n_gw)
     st.plotly_chart(fig, use_container_width=True)
     
     # Rankings table
@@ -395,6 +426,7 @@ def show_best_picks(team_fixtures, defensive_df, attacking_df, next_n_gw):
         st.markdown("*Target teams with weak defenses ahead*")
         
         # Combine with defensive weakness
+        conceded_by_team = _team_stat_lookup(defensive_df, 'goals_conceded_per_game')
         attacker_targets = []
         for _, team in best_fixtures.iterrows():
             team_name = team['team']
@@ -406,9 +438,8 @@ def show_best_picks(team_fixtures, defensive_df, attacking_df, next_n_gw):
             opponent_count = 0
             for fixture in fixture_opponents:
                 opponent_short = fixture.split('(')[0].strip()
-                opponent_data = defensive_df[defensive_df['short_name'] == opponent_short]
-                if not opponent_data.empty:
-                    avg_conceded += opponent_data.iloc[0].get('goals_conceded_per_game', 0)
+                if opponent_short in conceded_by_team:
+                    avg_conceded += conceded_by_team[opponent_short]
                     opponent_count += 1
             
             if opponent_count > 0:
@@ -437,6 +468,7 @@ def show_best_picks(team_fixtures, defensive_df, attacking_df, next_n_gw):
         st.markdown("*Target teams with weak attacks ahead*")
         
         # Combine with opponent attacking weakness
+        scored_by_team = _team_stat_lookup(attacking_df, 'goals_per_game')
         defender_targets = []
         for _, team in best_fixtures.iterrows():
             team_name = team['team']
@@ -447,9 +479,8 @@ def show_best_picks(team_fixtures, defensive_df, attacking_df, next_n_gw):
             opponent_count = 0
             for fixture in fixture_opponents:
                 opponent_short = fixture.split('(')[0].strip()
-                opponent_data = attacking_df[attacking_df['short_name'] == opponent_short]
-                if not opponent_data.empty:
-                    avg_scored += opponent_data.iloc[0].get('goals_per_game', 0)
+                if opponent_short in scored_by_team:
+                    avg_scored += scored_by_team[opponent_short]
                     opponent_count += 1
             
             if opponent_count > 0:
@@ -565,6 +596,8 @@ def show_advanced_stats(team_fixtures, defensive_df, attacking_df, next_n_gw, cu
             st.markdown(f"#### Next {next_n_gw} Fixtures")
             
             fixture_stats = []
+            conceded_by_team = _team_stat_lookup(defensive_df, 'goals_conceded_per_game')
+            scored_by_team = _team_stat_lookup(attacking_df, 'goals_per_game')
             
             for i, (fixture, difficulty) in enumerate(zip(team_data['fixture_list'], team_data['difficulty_scores'])):
                 opponent = fixture.split('(')[0].strip()
@@ -572,8 +605,8 @@ def show_advanced_stats(team_fixtures, defensive_df, attacking_df, next_n_gw, cu
                 gw = current_gw + i
                 
                 # Get opponent stats
-                opp_def = defensive_df[defensive_df['short_name'] == opponent]
-                opp_att = attacking_df[attacking_df['short_name'] == opponent]
+                opp_goals_conceded = conceded_by_team.get(opponent, 0)
+                opp_goals_scored = scored_by_team.get(opponent, 0)
                 
                 # Venue emoji
                 venue_emoji = '🏠' if venue == 'H' else '✈️'
@@ -582,14 +615,10 @@ def show_advanced_stats(team_fixtures, defensive_df, attacking_df, next_n_gw, cu
                 # Calculate key metrics
                 if venue == 'H':
                     # Home fixture
-                    opp_goals_conceded = opp_def.iloc[0]['goals_conceded_per_game'] if not opp_def.empty else 0
-                    opp_goals_scored = opp_att.iloc[0]['goals_per_game'] if not opp_att.empty else 0
                     attacking_potential = "High" if opp_goals_conceded > 1.5 else "Medium" if opp_goals_conceded > 1.0 else "Low"
                     defensive_risk = "High" if opp_goals_scored > 1.5 else "Medium" if opp_goals_scored > 1.0 else "Low"
                 else:
                     # Away fixture
-                    opp_goals_conceded = opp_def.iloc[0]['goals_conceded_per_game'] if not opp_def.empty else 0
-                    opp_goals_scored = opp_att.iloc[0]['goals_per_game'] if not opp_att.empty else 0
                     attacking_potential = "Medium" if opp_goals_conceded > 1.3 else "Low" if opp_goals_conceded > 0.8 else "Very Low"
                     defensive_risk = "High" if opp_goals_scored > 1.8 else "Medium" if opp_goals_scored > 1.3 else "Low"
                 
@@ -609,14 +638,15 @@ def show_advanced_stats(team_fixtures, defensive_df, attacking_df, next_n_gw, cu
             fixture_df = pd.DataFrame(fixture_stats)
             
             if not fixture_df.empty:
-                # Color coding for metrics
-                def color_fdr(val):
-                    if val < 2.5:
-                        return 'background-color: #40E0D0; color: black'
-                    elif val < 3.5:
-                        return 'background-color: #E0E0E0; color: black'
-                    else:
-                        return 'background-color: #FF69B4; color: black'
+                # Color coding for metrics - FDR styles looked up for the whole column at once
+                fdr_styles = np.array([
+                    'background-color: #40E0D0; color: black',
+                    'background-color: #E0E0E0; color: black',
+                    'background-color: #FF69B4; color: black'
+                ], dtype=object)
+                
+                def color_fdr(col):
+                    return fdr_styles[np.digitize(col.to_numpy(dtype=float), [2.5, 3.5])]
                 
                 def color_potential(val):
                     if val == 'High':
@@ -630,7 +660,7 @@ def show_advanced_stats(team_fixtures, defensive_df, attacking_df, next_n_gw, cu
                     'FDR': '{:.2f}',
                     'Opp Conceded/G': '{:.2f}',
                     'Opp Scored/G': '{:.2f}'
-                }).applymap(color_fdr, subset=['FDR']) \
+                }).apply(color_fdr, subset=['FDR']) \
                   .applymap(color_potential, subset=['Attack Potential', 'CS Probability'])
                 
                 st.dataframe(styled_df, use_container_width=True, hide_index=True)
@@ -644,7 +674,7 @@ def show_advanced_stats(team_fixtures, defensive_df, attacking_df, next_n_gw, cu
                 # FDR trend line
                 fig_fdr = go.Figure()
                 
-                fig_fdr.add_trace(go.Scatter(
+                fig_fdr.add_trace(go.Scattergl(
                     x=[f"GW{current_gw + i}" for i in range(len(team_data['difficulty_scores']))],
                     y=team_data['difficulty_scores'],
                     mode='lines+markers',
@@ -663,7 +693,8 @@ def show_advanced_stats(team_fixtures, defensive_df, attacking_df, next_n_gw, cu
                     title="Fixture Difficulty Over Time",
                     yaxis_title="FDR",
                     yaxis=dict(range=[0, 5]),
-                    height=300
+                    height=300,
+                    hovermode='x'
                 )
                 
                 st.plotly_chart(fig_fdr, use_container_width=True)
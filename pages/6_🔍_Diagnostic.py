@@ -189,6 +189,7 @@ if st.button("🔄 Reload Data from Files", type="primary"):
             st.session_state.match_data = data['match_data']
             st.session_state.team_defensive = data['team_defensive']
             st.session_state.team_attacking = data['team_attacking']
+            st.session_state.data_version = data['data_version']
             st.session_state.data_loaded = True
             st.success("✅ Data reloaded! Refresh this page to see updated results.")
             st.rerun()
\ No newline at end of file
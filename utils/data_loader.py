@@ -1,12 +1,19 @@
 """
 Data loader utility for FPL Dashboard
-Loads preprocessed data from CSV files
+Loads preprocessed data from CSV files (cached as Parquet after the first read)
 """
 
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import os
+import tempfile
+
+try:
+    from pyarrow.lib import ArrowException
+    PARQUET_ERRORS = (ImportError, OSError, ArrowException)
+except ImportError:
+    PARQUET_ERRORS = (ImportError, OSError)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 
@@ -27,6 +34,42 @@ def check_data_exists():
     
     return True
 
+def read_data_file(csv_path):
+    """
+    Read a scraped CSV, going through a Parquet copy stored next to it.
+    The Parquet copy is (re)built whenever the CSV is newer, so a data
+    refresh is picked up automatically.
+    """
+    parquet_path = csv_path.with_suffix('.parquet')
+    
+    if not parquet_path.exists() or parquet_path.stat().st_mtime < csv_path.stat().st_mtime:
+        df = pd.read_csv(csv_path)
+        
+        # Write to a temporary file and swap it in, so a reader never sees a half-written copy
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=parquet_path.parent, suffix='.parquet.tmp')
+            os.close(fd)
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, parquet_path)
+        except PARQUET_ERRORS as e:
+            # No parquet engine available (or unsupported dtypes) - stay on CSV
+            print(f"Warning: could not cache {csv_path.name} as Parquet: {e}")
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        # Already parsed - only later loads read the Parquet copy
+        return df
+    
+    try:
+        return pd.read_parquet(parquet_path)
+    except PARQUET_ERRORS as e:
+        # Drop the unreadable copy so the next load rebuilds it instead of failing again
+        print(f"Warning: could not read {parquet_path.name}, falling back to CSV: {e}")
+        parquet_path.unlink(missing_ok=True)
+        return pd.read_csv(csv_path)
+
 def load_player_data():
     """Load enhanced player aggregation data"""
     file_path = DATA_DIR / 'enhanced_player_aggregation.csv'
@@ -34,7 +77,7 @@ def load_player_data():
     if not file_path.exists():
         return None
     
-    df = pd.read_csv(file_path)
+    df = read_data_file(file_path)
     
     # Ensure numeric columns are properly typed
     numeric_cols = df.select_dtypes(include=[np.number]).columns
@@ -49,12 +92,17 @@ def load_match_data():
     if not file_path.exists():
         return None
     
-    df = pd.read_csv(file_path)
+    df = read_data_file(file_path)
     
     # Ensure numeric columns
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     df[numeric_cols] = df[numeric_cols].fillna(0)
     
+    # Group each player's matches together, most recent first, so pages can
+    # slice a player's history without re-sorting it
+    if 'full_name' in df.columns and 'round' in df.columns:
+        df = df.sort_values(['full_name', 'round'], ascending=[True, False]).reset_index(drop=True)
+    
     return df
 
 def load_team_data():
@@ -66,15 +114,26 @@ def load_team_data():
     attacking_df = None
     
     if defensive_path.exists():
-        defensive_df = pd.read_csv(defensive_path)
+        defensive_df = read_data_file(defensive_path)
     
     if attacking_path.exists():
-        attacking_df = pd.read_csv(attacking_path)
+        attacking_df = read_data_file(attacking_path)
     
     return defensive_df, attacking_df
 
+def get_data_version():
+    """
+    Fingerprint of the CSV files in the data directory. It changes whenever a
+    refresh rewrites them, so caches keyed on it never serve an older load.
+    """
+    return tuple(
+        (path.name, path.stat().st_mtime_ns, path.stat().st_size)
+        for path in sorted(DATA_DIR.glob('*.csv'))
+    )
+
 def load_fpl_data():
     """Load all FPL data"""
+    data_version = get_data_version()
     player_data = load_player_data()
     match_data = load_match_data()
     team_defensive, team_attacking = load_team_data()
@@ -86,7 +145,8 @@ def load_fpl_data():
         'player_data': player_data,
         'match_data': match_data,
         'team_defensive': team_defensive,
-        'team_attacking': team_attacking
+        'team_attacking': team_attacking,
+        'data_version': data_version
     }
 
 def get_player_list(df, position=None, min_minutes=0):
@@ -5,6 +5,7 @@ UPDATED: Skip nearly-complete gameweeks
 """
 
 import requests
+import streamlit as st
 import pandas as pd
 import numpy as np
 from typing import Dict, List
@@ -19,9 +20,9 @@ class FixtureAnalyzer:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.teams = {}
+        self.team_ids = {}  # Team name -> team id
         self.fixtures = []
         self.current_gw = None
-        self.first_full_gw = None  # First GW where most teams have fixtures
     
     def get_bootstrap_data(self) -> Dict:
         """Fetch main FPL bootstrap data"""
@@ -48,6 +49,7 @@ class FixtureAnalyzer:
                 'strength_defence_home': team['strength_defence_home'],
                 'strength_defence_away': team['strength_defence_away'],
             }
+            self.team_ids[team['name']] = team['id']
         
         # Get current gameweek
         for event in data['events']:
@@ -119,23 +121,24 @@ class FixtureAnalyzer:
         
         fixtures_df = self.get_all_fixtures()
         
-        # Find first gameweek where most teams have fixtures
-        self.first_full_gw = self.find_first_full_gameweek(fixtures_df)
+        # Find first gameweek where most teams have fixtures. Kept local so a
+        # shared analyzer is never mutated by an analysis call
+        first_full_gw = self.find_first_full_gameweek(fixtures_df)
         
-        if self.first_full_gw is None:
-            self.first_full_gw = self.current_gw
+        if first_full_gw is None:
+            first_full_gw = self.current_gw
         
         # Filter for upcoming unfinished fixtures starting from first full gameweek
         upcoming = fixtures_df[
             (fixtures_df['finished'] == False) &
             (fixtures_df['event'].notna()) &
-            (fixtures_df['event'] >= self.first_full_gw) &
-            (fixtures_df['event'] < self.first_full_gw + next_n_gameweeks)
+            (fixtures_df['event'] >= first_full_gw) &
+            (fixtures_df['event'] < first_full_gw + next_n_gameweeks)
         ].copy()
         
         upcoming = upcoming.sort_values(['event', 'kickoff_time'])
         
-        print(f"Analyzing GW{self.first_full_gw} to GW{self.first_full_gw + next_n_gameweeks - 1}")
+        print(f"Analyzing GW{first_full_gw} to GW{first_full_gw + next_n_gameweeks - 1}")
         print(f"Found {len(upcoming)} fixtures")
         
         return upcoming
@@ -211,6 +214,80 @@ class FixtureAnalyzer:
         
         return round(difficulty, 2)
     
+    def calculate_fixture_difficulty_batch(self, team_ids, opponent_ids, is_home,
+                                           team_form_df: pd.DataFrame = None) -> np.ndarray:
+        """
+        Vectorized calculate_fixture_difficulty over arrays of fixtures
+        Returns the difficulty of each (team, opponent, venue) triple
+        """
+        team_ids = np.asarray(team_ids)
+        opponent_ids = np.asarray(opponent_ids)
+        is_home = np.asarray(is_home, dtype=bool)
+        
+        teams = pd.DataFrame.from_dict(self.teams, orient='index')
+        opponents = teams.loc[opponent_ids]
+        team_names = teams.loc[team_ids, 'name'].to_numpy()
+        opponent_names = opponents['name'].to_numpy()
+        
+        # 1. Base opponent strength (1-5 scale)
+        opponent_strength = np.where(
+            is_home,
+            opponents['strength_overall_away'].to_numpy(),
+            opponents['strength_overall_home'].to_numpy()
+        ) / 1000  # Normalize to 0-1
+        
+        base_difficulty = opponent_strength * 5  # Scale to 1-5
+        
+        # 2. Home/Away adjustment
+        home_advantage = np.where(is_home, -0.5, 0.5)  # Easier at home
+        
+        # 3-5. Form factors, 0 for teams without form data
+        defensive_difficulty = np.zeros(len(team_ids))
+        attacking_threat = np.zeros(len(team_ids))
+        team_form_factor = np.zeros(len(team_ids))
+        
+        if team_form_df is not None and not team_form_df.empty:
+            # First row per team, as the scalar version uses
+            form = team_form_df.drop_duplicates('team').set_index('team')
+            
+            def form_value(names, column, default):
+                found = np.isin(names, form.index)
+                if column in form.columns:
+                    values = form[column].reindex(names).to_numpy(dtype=float)
+                else:
+                    values = np.full(len(names), default, dtype=float)
+                return found, values
+            
+            def clamp(values, low, high):
+                # A missing value lands on the upper bound, like min()/max() with NaN
+                return np.where(np.isnan(values), high, np.clip(values, low, high))
+            
+            # Higher goals conceded = easier for attackers
+            # Normalize: 2.0+ conceded = easy (0), 0.5 conceded = hard (1)
+            found, goals_conceded = form_value(opponent_names, 'goals_conceded_per_game', 1.5)
+            defensive_difficulty = np.where(found, clamp((2.0 - goals_conceded) / 1.5, 0, 1), 0)
+            
+            # Higher goals scored = harder to keep clean sheet
+            # Normalize: 0.5 goals = easy (0), 2.5+ goals = hard (1)
+            found, goals_scored = form_value(opponent_names, 'goals_per_game', 1.5)
+            attacking_threat = np.where(found, clamp((goals_scored - 0.5) / 2.0, 0, 1), 0)
+            
+            # Better form = can handle tougher fixtures
+            found, goals_scored = form_value(team_names, 'goals_per_game', 1.0)
+            team_form_factor = np.where(found, -clamp((goals_scored - 1.0) / 2.0, 0, 0.5), 0)
+        
+        # Weighted combination
+        difficulty = (
+            base_difficulty * 0.4 +
+            home_advantage +
+            defensive_difficulty * 0.8 +
+            attacking_threat * 0.4 +
+            team_form_factor
+        )
+        
+        # Normalize to 1-5 scale (like FPL FDR)
+        return np.round(np.clip(difficulty, 1.0, 5.0), 2)
+    
     def analyze_team_fixtures(self, next_n_gameweeks: int = 5, 
                               team_form_df: pd.DataFrame = None) -> pd.DataFrame:
         """
@@ -224,75 +301,56 @@ class FixtureAnalyzer:
             print("Warning: No upcoming fixtures found")
             return pd.DataFrame()
         
+        # One row per (team, fixture): home fixtures first, then away, as each
+        # team's list is ordered by gameweek with a stable sort
+        home = pd.DataFrame({
+            'team_id': upcoming_fixtures['team_h'].to_numpy(),
+            'opponent_id': upcoming_fixtures['team_a'].to_numpy(),
+            'is_home': True,
+            'gw': upcoming_fixtures['event'].to_numpy()
+        })
+        away = pd.DataFrame({
+            'team_id': upcoming_fixtures['team_a'].to_numpy(),
+            'opponent_id': upcoming_fixtures['team_h'].to_numpy(),
+            'is_home': False,
+            'gw': upcoming_fixtures['event'].to_numpy()
+        })
+        team_rows = pd.concat([home, away], ignore_index=True)
+        team_rows = team_rows.sort_values(['team_id', 'gw'], kind='stable')
+        
+        # Take only the first N fixtures of each team
+        team_rows = team_rows.groupby('team_id', sort=False).head(next_n_gameweeks)
+        
+        team_rows['difficulty'] = self.calculate_fixture_difficulty_batch(
+            team_rows['team_id'], team_rows['opponent_id'], team_rows['is_home'], team_form_df
+        )
+        short_names = pd.Series({tid: info['short_name'] for tid, info in self.teams.items()})
+        team_rows['fixture'] = (
+            team_rows['opponent_id'].map(short_names) +
+            np.where(team_rows['is_home'], ' (H)', ' (A)')
+        )
+        
         team_fixture_data = []
+        fixtures_by_team = team_rows.groupby('team_id', sort=False)
         
         for team_id, team_info in self.teams.items():
-            # Get all fixtures for this team (home and away)
-            home_fixtures = upcoming_fixtures[upcoming_fixtures['team_h'] == team_id].copy()
-            away_fixtures = upcoming_fixtures[upcoming_fixtures['team_a'] == team_id].copy()
-            
-            # Combine all fixtures into a list with gameweek info
-            all_fixtures = []
-            
-            # Add home fixtures
-            for _, fixture in home_fixtures.iterrows():
-                opponent_id = fixture['team_a']
-                opponent_short = self.teams[opponent_id]['short_name']
-                gw = fixture['event']
-                
-                difficulty = self.calculate_fixture_difficulty(
-                    team_id, opponent_id, True, team_form_df
-                )
-                
-                all_fixtures.append({
-                    'gw': gw,
-                    'opponent_short': opponent_short,
-                    'is_home': True,
-                    'difficulty': difficulty
-                })
-            
-            # Add away fixtures
-            for _, fixture in away_fixtures.iterrows():
-                opponent_id = fixture['team_h']
-                opponent_short = self.teams[opponent_id]['short_name']
-                gw = fixture['event']
-                
-                difficulty = self.calculate_fixture_difficulty(
-                    team_id, opponent_id, False, team_form_df
-                )
-                
-                all_fixtures.append({
-                    'gw': gw,
-                    'opponent_short': opponent_short,
-                    'is_home': False,
-                    'difficulty': difficulty
-                })
+            if team_id not in fixtures_by_team.groups:
+                continue
             
-            # Sort by gameweek to get chronological order
-            all_fixtures.sort(key=lambda x: x['gw'])
+            team_group = fixtures_by_team.get_group(team_id)
+            fixtures_list = team_group['fixture'].tolist()
+            difficulty_scores = team_group['difficulty'].tolist()
             
-            # Take only the first N fixtures
-            all_fixtures = all_fixtures[:next_n_gameweeks]
-            
-            if all_fixtures:
-                fixtures_list = []
-                difficulty_scores = []
-                
-                for fixture in all_fixtures:
-                    venue = 'H' if fixture['is_home'] else 'A'
-                    fixtures_list.append(f"{fixture['opponent_short']} ({venue})")
-                    difficulty_scores.append(fixture['difficulty'])
-                
-                team_fixture_data.append({
-                    'team': team_info['name'],
-                    'short_name': team_info['short_name'],
-                    'fixtures': ', '.join(fixtures_list),
-                    'num_fixtures': len(fixtures_list),
-                    'avg_difficulty': round(np.mean(difficulty_scores), 2),
-                    'total_difficulty': round(sum(difficulty_scores), 2),
-                    'difficulty_scores': difficulty_scores,
-                    'fixture_list': fixtures_list
-                })
+            team_fixture_data.append({
+                'team': team_info['name'],
+                'short_name': team_info['short_name'],
+                'fixtures': ', '.join(fixtures_list),
+                'num_fixtures': len(fixtures_list),
+                'avg_difficulty': round(np.mean(difficulty_scores), 2),
+                'total_difficulty': round(sum(difficulty_scores), 2),
+                'difficulty_scores': difficulty_scores,
+                'fixture_list': fixtures_list
+            })
         
         df = pd.DataFrame(team_fixture_data)
         
@@ -314,62 +372,79 @@ class FixtureAnalyzer:
         if upcoming_fixtures.empty:
             return pd.DataFrame()
         
-        detailed_fixtures = []
+        team_h = upcoming_fixtures['team_h'].to_numpy()
+        team_a = upcoming_fixtures['team_a'].to_numpy()
         
-        for _, fixture in upcoming_fixtures.iterrows():
-            gw = fixture['event']
-            team_h_id = fixture['team_h']
-            team_a_id = fixture['team_a']
-            
-            # Calculate difficulty for home team
-            h_difficulty = self.calculate_fixture_difficulty(
-                team_h_id, team_a_id, True, team_form_df
-            )
-            
-            # Calculate difficulty for away team
-            a_difficulty = self.calculate_fixture_difficulty(
-                team_a_id, team_h_id, False, team_form_df
-            )
-            
-            detailed_fixtures.append({
-                'gameweek': gw,
-                'fixture': f"{fixture['team_h_short']} vs {fixture['team_a_short']}",
-                'home_team': fixture['team_h_name'],
-                'away_team': fixture['team_a_name'],
-                'home_difficulty': h_difficulty,
-                'away_difficulty': a_difficulty,
-                'kickoff_time': fixture.get('kickoff_time', '')
-            })
+        # Difficulty for the home and away team of every fixture in one batch
+        h_difficulty = self.calculate_fixture_difficulty_batch(
+            team_h, team_a, np.ones(len(team_h), dtype=bool), team_form_df
+        )
+        a_difficulty = self.calculate_fixture_difficulty_batch(
+            team_a, team_h, np.zeros(len(team_a), dtype=bool), team_form_df
+        )
         
-        return pd.DataFrame(detailed_fixtures)
+        return pd.DataFrame({
+            'gameweek': upcoming_fixtures['event'].to_numpy(),
+            'fixture': (upcoming_fixtures['team_h_short'] + ' vs ' + upcoming_fixtures['team_a_short']).to_numpy(),
+            'home_team': upcoming_fixtures['team_h_name'].to_numpy(),
+            'away_team': upcoming_fixtures['team_a_name'].to_numpy(),
+            'home_difficulty': h_difficulty,
+            'away_difficulty': a_difficulty,
+            'kickoff_time': upcoming_fixtures.get('kickoff_time', pd.Series('', index=upcoming_fixtures.index)).to_numpy()
+        })
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_fixture_analyzer() -> FixtureAnalyzer:
+    """
+    Initialized analyzer shared by every page and session, refreshed hourly
+    so the current gameweek and team strengths stay current
+    """
+    analyzer = FixtureAnalyzer()
+    analyzer.initialize()
+    return analyzer
+
+
+def merge_team_form(defensive_df: pd.DataFrame = None,
+                    attacking_df: pd.DataFrame = None) -> pd.DataFrame:
+    """Combine team defensive and attacking analysis into one team form table"""
+    if defensive_df is None or attacking_df is None:
+        return None
+    
+    return defensive_df.merge(
+        attacking_df,
+        on=['team', 'short_name', 'games_played'],
+        how='outer',
+        suffixes=('_def', '_att')
+    )
 
 
 def analyze_fixtures(next_n_gameweeks: int = 5, 
                      defensive_df: pd.DataFrame = None,
-                     attacking_df: pd.DataFrame = None) -> Dict:
+                     attacking_df: pd.DataFrame = None,
+                     analyzer: FixtureAnalyzer = None,
+                     team_form_df: pd.DataFrame = None) -> Dict:
     """
     Main function to analyze fixtures
     
+    An already initialized analyzer and a pre-merged team form table can be
+    passed in so callers can reuse them across calls.
+    
     Returns dictionary with:
     - team_fixtures: DataFrame with team fixture difficulty rankings
     - detailed_fixtures: DataFrame with individual fixture details
     - current_gw: Current/starting gameweek number
     """
     
-    analyzer = FixtureAnalyzer()
-    analyzer.initialize()
+    if analyzer is None:
+        analyzer = FixtureAnalyzer()
+        analyzer.initialize()
     
     print(f"Current gameweek: {analyzer.current_gw}")
     
     # Merge team form data if available
-    team_form_df = None
-    if defensive_df is not None and attacking_df is not None:
-        team_form_df = defensive_df.merge(
-            attacking_df,
-            on=['team', 'short_name', 'games_played'],
-            how='outer',
-            suffixes=('_def', '_att')
-        )
+    if team_form_df is None:
+        team_form_df = merge_team_form(defensive_df, attacking_df)
     
     # Get team fixture analysis (this will find first full gameweek)
     team_fixtures = analyzer.analyze_team_fixtures(next_n_gameweeks, team_form_df)
@@ -377,8 +452,11 @@ def analyze_fixtures(next_n_gameweeks: int = 5,
     # Get detailed fixture breakdown
     detailed_fixtures = analyzer.get_detailed_fixtures(next_n_gameweeks, team_form_df)
     
-    # Use first_full_gw as the starting point for display
-    starting_gw = analyzer.first_full_gw if analyzer.first_full_gw else analyzer.current_gw
+    # Use the first full gameweek (the earliest one analyzed) as the starting point for display
+    if not detailed_fixtures.empty:
+        starting_gw = int(detailed_fixtures['gameweek'].min())
+    else:
+        starting_gw = analyzer.current_gw
     
     print(f"Found fixtures for {len(team_fixtures)} teams")
     print(f"Total individual fixtures: {len(detailed_fixtures)}")